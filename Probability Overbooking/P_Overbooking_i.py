@@ -1,10 +1,31 @@
-import numpy as np
-
-# Simulation parameters
-num_flights = 100  # Total flights per day
-seats_per_flight = 400  # Seats available per flight
-no_show_rate = 0.075  # No-show rate
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from overbooking.correlated import correlated_range_stats
+from overbooking.export import export_results
+from overbooking.profiles import international_profile
+from overbooking.rare_events import tail_probabilities
+from overbooking.revenue import strategy_overbooking_probabilities
+from overbooking.summary import format_range_report, format_tail_report
+
+# Simulation parameters (flight economics live in overbooking.profiles)
+profile = international_profile
 num_simulations = 1000  # Number of Monte Carlo trials
+seed = None  # Random seed (None for a fresh run)
+method = "monte_carlo"  # "monte_carlo" or "exact" (binomial convolution, no sampling)
+
+# Correlated no-shows: passengers on a flight and flights on a day share show-up shocks.
+# None keeps independent passengers; e.g. (from overbooking.correlated import NoShowModel)
+# NoShowModel.from_profile(profile, flight_correlation=0.01, day_sigma=0.15)
+no_show_model = None
+
+# Directory for the per-strategy results as typed columns (.npy + manifest.json; None to only print)
+export_dir = None
+
+# Importance-sampled trials for the rare "> upper bound" days, same event and passenger count as the
+# Monte Carlo report (0 to skip; e.g. 2000 adds a second pass over every strategy)
+rare_event_trials = 0
 
 # Different overbooking strategies
 booking_levels = {
@@ -15,64 +36,22 @@ booking_levels = {
     "Optimal Overbooking(6.25%)": 425 #Based on maximizing revenue in Max_Revenue code
 }
 
-
 lower_bound, upper_bound = .05, .15
 
-
-
-results = {}
-
-for strategy, booked_per_flight in booking_levels.items():
-    overbooked_passengers_per_day = []
-    
-    # Monte Carlo simulation
-    for _ in range(num_simulations):
-        total_overbooked = 0
-        
-        for _ in range(num_flights):
-            show_up = np.random.binomial(booked_per_flight, 1 - no_show_rate)  # Passengers who show up
-            overbooked = max(0, show_up - seats_per_flight)  # Count of overbooked passengers
-            total_overbooked += overbooked
-        
-        overbooked_passengers_per_day.append(total_overbooked)
-    
-    #calculate total pssangers andd overbooking rate per passanger
-    overbooked_passengers_per_day = np.array(overbooked_passengers_per_day)
-    total_passengers_per_day = num_flights * booked_per_flight
-    overbooking_rate_per_passenger = overbooked_passengers_per_day / total_passengers_per_day * 100
-    
-    # Calculate probabilities
-    prob_within_range = np.mean((overbooking_rate_per_passenger >= lower_bound) & (overbooking_rate_per_passenger <= upper_bound))
-    prob_above_range = np.mean(overbooking_rate_per_passenger > upper_bound)
-    prob_below_range = np.mean(overbooking_rate_per_passenger < lower_bound)
-    
-    # Convert to percentages
-    prob_within_range_pct = prob_within_range * 100
-    prob_above_range_pct = prob_above_range * 100
-    prob_below_range_pct = prob_below_range * 100
-    
-    avg_overbooking_rate = np.mean(overbooking_rate_per_passenger)
-    
-    if avg_overbooking_rate > 0:
-        one_in_x_passengers = round(1 / (avg_overbooking_rate / 100))
-        
-    else:
-        one_in_x_passengers = None
-        
-    lower_bound_people = round(.0005* num_flights * seats_per_flight)
-    upper_bound_people = round(.0015* num_flights * seats_per_flight) 
-
-    # Store results
-    results[strategy] = {
-    f"P of overbooking between {lower_bound_people} - {upper_bound_people} passengers": f"\t\t{prob_within_range_pct:.2f}%",
-    f"P of overbooking > {upper_bound_people} passengers": f"\t\t\t{prob_above_range_pct:.2f}%",
-    f"P of overbooking < {lower_bound_people} passengers": f"\t\t\t{prob_below_range_pct:.2f}%",
-    "Estimated overbooking rate per passenger": f"\t\t{avg_overbooking_rate:.3f}%",
-    f"\nOverbooking likelihood": f"1 in {one_in_x_passengers} passengers get overbooked." if one_in_x_passengers else "No overbookings"
-}
+# Monte Carlo simulation: one (num_simulations, num_flights) show-up matrix per strategy
+if no_show_model is None:
+    results = strategy_overbooking_probabilities(profile, booking_levels, num_simulations, seed, method, lower_bound, upper_bound)
+else:
+    results = correlated_range_stats(booking_levels, profile.seats_per_flight, no_show_model, profile.num_flights,
+                                     num_simulations, seed, lower_bound, upper_bound, method)
 
 #results
-for strategy, result in results.items():
-    print(f"\n{strategy} Strategy:")
-    for key, value in result.items():
-        print(f"{key}: {value}")
+print(format_range_report(results, profile, booking_levels, lower_bound, upper_bound))
+if export_dir:
+    export_results(export_dir, results, profile=profile, method=method, num_simulations=num_simulations, seed=seed,
+                   no_show_model=no_show_model, booked_per_flight=booking_levels)
+
+# Tail probabilities too small for plain Monte Carlo (independent no-shows)
+if rare_event_trials:
+    print(f"\nRare-event estimates ({rare_event_trials} importance-sampled days):")
+    print(format_tail_report(tail_probabilities(profile, booking_levels, rare_event_trials, seed, upper_bound)))
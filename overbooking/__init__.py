@@ -0,0 +1,6 @@
+from .engine import make_rng, overbooking_range_stats, simulate_overbooked_per_day, simulate_strategies
+from .fleet import Fleet, simulate_fleet
+from .profiles import FlightProfile, domestic_profile, international_profile, profiles
+from .revenue import (BumpStatistics, booking_level_sweep, bump_statistics, overbooking_level_sweep, rescore, rescore_compensations,
+                      run_simulation, simulate_strategy_revenues, strategy_overbooking_probabilities)
+from .solver import marginal_booking_limit, solve_booking_limit, solve_profile_booking_limit
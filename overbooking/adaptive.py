@@ -0,0 +1,98 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from .engine import make_rng
+from .variance import crn_overbooked_per_day
+
+# Days simulated for every level before the first comparison, and per round after it
+default_initial_days = 100
+default_round_days = 100
+
+
+# One-sided probability that a level with paired revenue differences d = best - level is
+# actually better than the chosen one, Phi(-mean / se); exact ties on identical draws count as 1
+def _prob_better(differences):
+    mean = differences.mean()
+    se = differences.std(ddof=1) / np.sqrt(len(differences)) if len(differences) > 1 else 0.0
+    return NormalDist().cdf(-mean / se) if se > 0 else float(mean <= 0)
+
+
+# Adaptive booking-level search by racing: every level still in the race gets round_days more days
+# (common random numbers, variance.crn_overbooked_per_day, so the daily revenue differences between
+# levels are paired and far less noisy than independent draws). After each round a level is dropped
+# once its paired difference to the current leader exceeds z standard errors, with z Bonferroni-
+# corrected over levels and rounds so the overall error stays below 1 - confidence. With concave=True
+# the revenue curve is taken as unimodal: a level dropped on one side of the leader also drops every
+# level further out on that side. The race stops when one level is left or every remaining level has
+# max_simulations days (the budget of a full sweep). Levels are sorted and de-duplicated on entry
+# (the concave pruning drops levels by position), so results come back in increasing level order.
+# Returns the booking_level_sweep fields (averages over each level's own days, so plots and
+# summaries work unchanged) plus days per level, standard errors, prob_best (a Bonferroni lower bound
+# on the probability that the chosen level is the best of all levels) and the simulation totals.
+def race_booking_levels(profile, booking_levels, max_simulations=1000, rng=None, confidence=0.95, concave=True,
+                        initial_days=default_initial_days, round_days=default_round_days):
+    rng = make_rng(rng)
+    booking_levels = np.unique(np.asarray(list(booking_levels)))
+    num_levels = len(booking_levels)
+    seats, no_show_rate, num_flights = profile.seats_per_flight, profile.no_show_rate, profile.num_flights
+    ticket_revenue = profile.ticket_revenue(booking_levels)
+    scale = profile.compensation_per_passenger / num_flights
+
+    num_rounds = 1 + max(0, -(-(max_simulations - initial_days) // round_days))
+    z = NormalDist().inv_cdf(1 - (1 - confidence) / (max(1, num_levels - 1) * num_rounds))
+
+    overbooked = np.zeros((num_levels, max_simulations), dtype=np.int64)
+    days = np.zeros(num_levels, dtype=np.int64)
+    alive = np.ones(num_levels, dtype=bool)
+    simulated = rounds = 0
+    while simulated < max_simulations and (rounds == 0 or alive.sum() > 1):
+        size = min(initial_days if rounds == 0 else round_days, max_simulations - simulated)
+        racing = np.flatnonzero(alive)
+        overbooked[racing, simulated:simulated + size] = crn_overbooked_per_day(
+            booking_levels[racing], seats, no_show_rate, num_flights, size, rng)
+        simulated += size
+        days[racing] = simulated
+        rounds += 1
+
+        # Paired daily revenue differences to the leader over the days all racing levels share
+        revenue = ticket_revenue[racing, None] - scale * overbooked[racing, :simulated]
+        leader = int(np.argmax(revenue.mean(axis=1)))
+        differences = revenue[leader] - revenue
+        se = differences.std(axis=1, ddof=1) / np.sqrt(simulated) if simulated > 1 else np.zeros(len(racing))
+        alive[racing[differences.mean(axis=1) - z * se > 0]] = False
+
+        if concave:
+            leader = racing[leader]
+            dropped_below = np.flatnonzero(~alive[:leader])
+            dropped_above = leader + 1 + np.flatnonzero(~alive[leader + 1:])
+            if dropped_below.size:
+                alive[:dropped_below.max()] = False
+            if dropped_above.size:
+                alive[dropped_above.min():] = False
+
+    # Averages over each level's own days; the best level is the leader among those still racing
+    revenue = [ticket_revenue[i] - scale * overbooked[i, :days[i]] for i in range(num_levels)]
+    avg_net_revenue = np.array([r.mean() for r in revenue])
+    std_net_revenue = np.array([r.std(ddof=1) if len(r) > 1 else 0.0 for r in revenue])
+    racing = np.flatnonzero(alive)
+    best = int(racing[np.argmax(avg_net_revenue[racing])])
+
+    # Each other level compared with the best on the days they share
+    prob_better = [_prob_better(revenue[best][:days[i]] - revenue[i]) for i in range(num_levels) if i != best]
+
+    return {
+        "booking_levels": booking_levels,
+        "avg_net_revenue": avg_net_revenue,
+        "std_net_revenue": std_net_revenue,
+        "standard_error": std_net_revenue / np.sqrt(days),
+        "avg_overbooked_passengers": np.array([overbooked[i, :days[i]].mean() for i in range(num_levels)]) / num_flights,
+        "num_simulations": days,
+        "best_booking_level": int(booking_levels[best]),
+        "best_revenue": float(avg_net_revenue[best]),
+        "prob_best": float(max(0.0, 1 - sum(prob_better))),
+        "identified": bool(alive.sum() == 1),
+        "rounds": rounds,
+        "total_simulations": int(days.sum()),
+        "full_sweep_simulations": num_levels * max_simulations,
+    }
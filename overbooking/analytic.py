@@ -0,0 +1,163 @@
+import numpy as np
+
+from .engine import lower_bound, upper_bound
+
+
+# log(k!) for k = 0..n_max
+def _log_factorial(n_max):
+    return np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n_max + 1)))))
+
+
+# Binomial PMF over k = 0..max(n) on the last axis; n and p broadcast against each other
+def binomial_pmf(n, p):
+    n = np.asarray(n, dtype=np.int64)
+    p = np.asarray(p, dtype=float)
+    n, p = np.broadcast_arrays(n, p)
+    n_max = int(n.max()) if n.size else 0
+    k = np.arange(n_max + 1)
+
+    n_ = n[..., None]
+    p_ = p[..., None]
+    valid = k <= n_
+    n_minus_k = np.where(valid, n_ - k, 0)
+
+    log_fact = _log_factorial(n_max)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # k*log(p) and (n-k)*log(1-p), taking 0*log(0) = 0 so p = 0 or 1 stay exact
+        log_p = np.where(k == 0, 0.0, k * np.log(p_))
+        log_q = np.where(n_minus_k == 0, 0.0, n_minus_k * np.log1p(-p_))
+        log_pmf = log_fact[n_] - log_fact[k] - log_fact[n_minus_k] + log_p + log_q
+    return np.exp(np.where(valid, log_pmf, -np.inf))
+
+
+# Binomial PMF at k = seats + j for j = 1..max(n - seats), i.e. only the overbooked tail.
+# Returns (pmf, j) with pmf of shape broadcast(n, p, seats) + (len(j),).
+def _overbooked_tail_pmf(n, p, seats):
+    n = np.asarray(n, dtype=np.int64)
+    p = np.asarray(p, dtype=float)
+    seats = np.asarray(seats, dtype=np.int64)
+    n, p, seats = np.broadcast_arrays(n, p, seats)
+    max_extra = int(np.max(n - seats)) if n.size else 0
+    j = np.arange(1, max(max_extra, 0) + 1)
+
+    n_ = n[..., None]
+    p_ = p[..., None]
+    k = seats[..., None] + j
+    valid = k <= n_
+    k = np.where(valid, k, 0)
+    n_minus_k = np.where(valid, n_ - k, 0)
+
+    log_fact = _log_factorial(int(n.max()) if n.size else 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_p = np.where(k == 0, 0.0, k * np.log(p_))
+        log_q = np.where(n_minus_k == 0, 0.0, n_minus_k * np.log1p(-p_))
+        log_pmf = log_fact[n_] - log_fact[k] - log_fact[n_minus_k] + log_p + log_q
+    return np.exp(np.where(valid, log_pmf, -np.inf)), j
+
+
+# Expected overbooked passengers on one flight: E[max(0, Shows - seats)]
+def expected_overbooked(booked_per_flight, seats, no_show_rate):
+    pmf, j = _overbooked_tail_pmf(booked_per_flight, 1 - np.asarray(no_show_rate), seats)
+    return np.sum(j * pmf, axis=-1)
+
+
+# Probability that at least one passenger is bumped on a flight: P(Shows > seats)
+def bump_probability(booked_per_flight, seats, no_show_rate):
+    pmf, _ = _overbooked_tail_pmf(booked_per_flight, 1 - np.asarray(no_show_rate), seats)
+    return np.sum(pmf, axis=-1)
+
+
+# Mean and variance of overbooked passengers on one flight
+def overbooked_moments(booked_per_flight, seats, no_show_rate):
+    pmf, j = _overbooked_tail_pmf(booked_per_flight, 1 - np.asarray(no_show_rate), seats)
+    mean = np.sum(j * pmf, axis=-1)
+    return mean, np.sum(j ** 2 * pmf, axis=-1) - mean ** 2
+
+
+# PMF of overbooked passengers j = 0..max(n - seats) for many flights at once (arguments broadcast);
+# returns (pmf, j) with pmf of shape broadcast(n, p, seats) + (len(j),), zero beyond a flight's own maximum
+def overbooked_pmfs(booked_per_flight, seats, no_show_rate):
+    tail, j = _overbooked_tail_pmf(booked_per_flight, 1 - np.asarray(no_show_rate), seats)
+    none = np.clip(1 - tail.sum(axis=-1, keepdims=True), 0.0, 1.0)
+    return np.concatenate((none, tail), axis=-1), np.concatenate(([0], j))
+
+
+# PMF of overbooked passengers on a single flight, index j = j bumped passengers
+def flight_overbooked_pmf(booked_per_flight, seats, no_show_rate):
+    pmf = binomial_pmf(booked_per_flight, 1 - no_show_rate)
+    if booked_per_flight <= seats:
+        return np.array([1.0])
+    bumps = pmf[seats:].copy()
+    bumps[0] = pmf[:seats + 1].sum()
+    return bumps
+
+
+# PMF of total overbooked passengers in a day of num_flights i.i.d. flights.
+# "fft" convolves the single-flight PMF exactly; "normal" uses a continuity-corrected
+# normal approximation on the same support.
+def daily_overbooked_pmf(booked_per_flight, seats, no_show_rate, num_flights, method="fft"):
+    single = flight_overbooked_pmf(booked_per_flight, seats, no_show_rate)
+    support = num_flights * (len(single) - 1) + 1
+
+    if method == "fft":
+        size = 1 << int(np.ceil(np.log2(support)))
+        daily = np.fft.irfft(np.fft.rfft(single, size) ** num_flights, size)[:support]
+        daily = np.clip(daily, 0.0, None)
+        return daily / daily.sum()
+
+    if method == "normal":
+        j = np.arange(len(single))
+        mean = num_flights * np.sum(j * single)
+        var = num_flights * (np.sum(j ** 2 * single) - np.sum(j * single) ** 2)
+        if var <= 0:
+            daily = np.zeros(support)
+            daily[int(round(mean))] = 1.0
+            return daily
+        edges = (np.arange(support + 1) - 0.5 - mean) / np.sqrt(2 * var)
+        cdf = 0.5 * (1 + _erf(edges))
+        cdf[0], cdf[-1] = 0.0, 1.0
+        return np.diff(cdf)
+
+    raise ValueError(f"Unknown method: {method}")
+
+
+# Vectorized error function (Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)
+def _erf(x):
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1 - poly * np.exp(-x * x))
+
+
+# Exact counterpart of engine.overbooking_range_stats, computed from the daily PMF
+def exact_range_stats(booked_per_flight, seats, no_show_rate, num_flights,
+                      lower_bound=lower_bound, upper_bound=upper_bound, method="fft"):
+    daily = daily_overbooked_pmf(booked_per_flight, seats, no_show_rate, num_flights, method)
+    expected = expected_overbooked(booked_per_flight, seats, no_show_rate)
+    return range_stats_from_daily_pmf(daily, expected, booked_per_flight, num_flights, lower_bound, upper_bound)
+
+
+# Range statistics from a PMF of daily overbooked passengers and the expected bumps per flight
+def range_stats_from_daily_pmf(daily, expected_per_flight, booked_per_flight, num_flights,
+                               lower_bound=lower_bound, upper_bound=upper_bound):
+    total_passengers_per_day = num_flights * booked_per_flight
+    overbooking_rate_per_passenger = np.arange(len(daily)) / total_passengers_per_day * 100
+
+    prob_within_range = np.sum(daily[(overbooking_rate_per_passenger >= lower_bound) & (overbooking_rate_per_passenger <= upper_bound)])
+    prob_above_range = np.sum(daily[overbooking_rate_per_passenger > upper_bound])
+    prob_below_range = np.sum(daily[overbooking_rate_per_passenger < lower_bound])
+    avg_overbooking_rate = expected_per_flight / booked_per_flight * 100
+
+    if avg_overbooking_rate > 0:
+        one_in_x_passengers = round(1 / (avg_overbooking_rate / 100))
+    else:
+        one_in_x_passengers = None
+
+    return {
+        "prob_within_range": float(prob_within_range) * 100,
+        "prob_above_range": float(prob_above_range) * 100,
+        "prob_below_range": float(prob_below_range) * 100,
+        "avg_overbooking_rate": float(avg_overbooking_rate),
+        "one_in_x_passengers": one_in_x_passengers,
+    }
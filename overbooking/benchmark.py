@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+
+from .adaptive import race_booking_levels
+from .analytic import expected_overbooked
+from .compensation import clv_cases, exact_expected_costs, simulate_expected_costs
+from .engine import simulate_overbooked_per_day
+from .fleet import Fleet, simulate_fleet
+from .grid import sensitivity_grid
+from .profiles import profiles
+from .revenue import booking_level_sweep
+from .solver import solve_profile_booking_limit
+from .streaming import stream_overbooking_stats
+
+# Scale factors: (simulated days, levels swept) per run
+scales = {
+    "small": (100, 5),
+    "medium": (1000, 15),
+    "large": (5000, 35),
+}
+
+default_history = "benchmark_history.json"
+
+
+# Levels swept around capacity, starting at seats
+def _levels(profile, num_levels):
+    return list(range(profile.seats_per_flight, profile.seats_per_flight + num_levels))
+
+
+# Benchmark cases: name -> function(profile, num_simulations, num_levels) returning the
+# number of simulated flight-days (trials) it processed
+def _bench_engine(profile, num_simulations, num_levels):
+    simulate_overbooked_per_day(_levels(profile, num_levels), profile.seats_per_flight, profile.no_show_rate,
+                                profile.num_flights, num_simulations, 0)
+    return num_simulations * profile.num_flights * num_levels
+
+
+def _bench_sweep(profile, num_simulations, num_levels):
+    booking_level_sweep(profile, _levels(profile, num_levels), num_simulations, 0)
+    return num_simulations * profile.num_flights * num_levels
+
+
+def _bench_sweep_kernel(profile, num_simulations, num_levels):
+    booking_level_sweep(profile, _levels(profile, num_levels), num_simulations, 0, method="kernel")
+    return num_simulations * profile.num_flights * num_levels
+
+
+def _bench_race(profile, num_simulations, num_levels):
+    race = race_booking_levels(profile, _levels(profile, num_levels), num_simulations, 0)
+    return race["total_simulations"] * profile.num_flights
+
+
+def _bench_sweep_exact(profile, num_simulations, num_levels):
+    booking_level_sweep(profile, _levels(profile, num_levels), method="exact")
+    return num_levels
+
+
+def _bench_solver(profile, num_simulations, num_levels):
+    solve_profile_booking_limit(profile, num_levels)
+    return num_levels
+
+
+def _bench_streaming(profile, num_simulations, num_levels):
+    stream_overbooking_stats(profile.seats_per_flight + num_levels // 2, profile.seats_per_flight, profile.no_show_rate,
+                             profile.num_flights, num_simulations, rng=0)
+    return num_simulations * profile.num_flights
+
+
+def _bench_compensation(profile, num_simulations, num_levels):
+    n_passengers = num_simulations * 100
+    simulate_expected_costs(clv_cases, n_passengers, 0)
+    return n_passengers * len(clv_cases)
+
+
+def _bench_grid(profile, num_simulations, num_levels):
+    no_show_rates = np.round(np.linspace(0.00, 0.20, 41), 3)
+    compensations = np.linspace(0.5, 1.5, 43) * profile.compensation_per_passenger
+    sensitivity_grid(compensations, no_show_rates, range(profile.seats_per_flight, profile.seats_per_flight + 99),
+                     profile.seats_per_flight, profile.class_shares, profile.economy_price, profile.business_price,
+                     profile.first_price, method="exact")
+    return len(no_show_rates) * len(compensations) * 99
+
+
+def _bench_fleet(profile, num_simulations, num_levels):
+    fleet = Fleet.from_profile(profile, profile.seats_per_flight + num_levels // 2)
+    simulate_fleet(fleet, num_simulations, 0)
+    return num_simulations * profile.num_flights
+
+
+cases = {
+    "engine.simulate_overbooked_per_day": _bench_engine,
+    "revenue.booking_level_sweep": _bench_sweep,
+    "revenue.booking_level_sweep[kernel]": _bench_sweep_kernel,
+    "revenue.booking_level_sweep[exact]": _bench_sweep_exact,
+    "adaptive.race_booking_levels": _bench_race,
+    "solver.solve_profile_booking_limit": _bench_solver,
+    "streaming.stream_overbooking_stats": _bench_streaming,
+    "compensation.simulate_expected_costs": _bench_compensation,
+    "grid.sensitivity_grid[exact]": _bench_grid,
+    "fleet.simulate_fleet": _bench_fleet,
+}
+
+
+# Peak resident set size of this process in MB
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+# Run one case in the current process and measure it
+def _run_case(task):
+    case, profile_name, scale = task
+    num_simulations, num_levels = scales[scale]
+    start = time.perf_counter()
+    trials = cases[case](profiles[profile_name], num_simulations, num_levels)
+    wall_time = time.perf_counter() - start
+    return {
+        "case": case,
+        "profile": profile_name,
+        "scale": scale,
+        "wall_time": wall_time,
+        "trials": trials,
+        "trials_per_second": trials / wall_time if wall_time > 0 else float("inf"),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# Each case runs in a fresh process so its peak RSS is its own
+def run_benchmarks(case_names=None, profile_names=None, scale_names=("small",)):
+    tasks = [(case, profile_name, scale)
+             for scale in scale_names
+             for profile_name in (profile_names or profiles)
+             for case in (case_names or cases)]
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for task in tasks:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(_run_case, task).result())
+    return results
+
+
+# Statistical equivalence of the vectorized engines against the original script loops and
+# the exact results. Returns a list of (check, z score); |z| above z_limit means a mismatch.
+def equivalence_checks(num_simulations=200, seed=0):
+    rng = np.random.default_rng(seed)
+    checks = []
+
+    for profile_name, profile in profiles.items():
+        # Level around the expected-show break-even, where bumps are frequent
+        booked = int(round(profile.seats_per_flight / (1 - profile.no_show_rate)))
+        seats, no_show_rate, num_flights = profile.seats_per_flight, profile.no_show_rate, profile.num_flights
+
+        # Original P_Overbooking/Max_Revenue loop: one binomial vector per simulated day
+        reference = np.array([np.maximum(0, rng.binomial(booked, 1 - no_show_rate, num_flights) - seats).sum()
+                              for _ in range(num_simulations)])
+        engine = simulate_overbooked_per_day(booked, seats, no_show_rate, num_flights, num_simulations, rng)
+        exact = num_flights * expected_overbooked(booked, seats, no_show_rate)
+        checks.append((f"{profile_name}: engine vs script loop", _two_sample_z(engine, reference)))
+        checks.append((f"{profile_name}: engine vs exact", _one_sample_z(engine, exact)))
+
+        stream = stream_overbooking_stats(booked, seats, no_show_rate, num_flights, num_simulations, rng=rng)
+        checks.append((f"{profile_name}: streaming vs exact",
+                       (stream["mean_overbooked_per_day"] - exact) / max(stream["standard_error"], 1 / num_simulations)))
+
+        levels = [seats, booked]
+        mc = booking_level_sweep(profile, levels, num_simulations, seed)
+        ex = booking_level_sweep(profile, levels, method="exact")
+        per_day = simulate_overbooked_per_day(booked, seats, no_show_rate, num_flights, num_simulations, rng)
+        revenue_se = profile.compensation_per_passenger / num_flights * per_day.std(ddof=1) / np.sqrt(num_simulations)
+        checks.append((f"{profile_name}: revenue sweep vs exact",
+                       (mc["avg_net_revenue"][1] - ex["avg_net_revenue"][1]) / max(revenue_se, 1 / num_simulations)))
+
+    simulated = simulate_expected_costs(clv_cases, 20_000, rng)
+    exact_costs = exact_expected_costs(clv_cases)
+    for label in clv_cases:
+        checks.append((f"CLV {label}: simulated vs exact",
+                       (simulated[label]["mean_cost"] - exact_costs[label]) / simulated[label]["std_error"]))
+    return checks
+
+
+def _one_sample_z(samples, expected):
+    se = np.std(samples, ddof=1) / np.sqrt(len(samples))
+    return float((np.mean(samples) - expected) / max(se, 1 / len(samples)))
+
+
+def _two_sample_z(a, b):
+    se = np.sqrt(np.var(a, ddof=1) / len(a) + np.var(b, ddof=1) / len(b))
+    return float((np.mean(a) - np.mean(b)) / max(se, 1 / min(len(a), len(b))))
+
+
+# Runs whose wall time exceeds (1 + threshold) x the median of earlier runs of the same case
+# (plus min_delta seconds, so timer noise on millisecond cases is not flagged)
+def find_regressions(results, history, threshold=0.25, min_delta=0.005):
+    regressions = []
+    for result in results:
+        key = (result["case"], result["profile"], result["scale"])
+        previous = [r["wall_time"] for run in history for r in run["results"]
+                    if (r["case"], r["profile"], r["scale"]) == key]
+        if not previous:
+            continue
+        baseline = float(np.median(previous))
+        if result["wall_time"] > (1 + threshold) * baseline + min_delta:
+            regressions.append((result, baseline))
+    return regressions
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    with open(path, "w") as f:
+        json.dump(history, f, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the overbooking simulation entry points")
+    parser.add_argument("--scale", nargs="+", default=["small"], choices=list(scales))
+    parser.add_argument("--profile", nargs="+", default=None, choices=list(profiles))
+    parser.add_argument("--case", nargs="+", default=None, choices=list(cases))
+    parser.add_argument("--history", default=default_history, help="JSON history file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs history median (0.25 = 25%%)")
+    parser.add_argument("--z-limit", type=float, default=4.0, help="largest accepted |z| in the equivalence checks")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    parser.add_argument("--skip-equivalence", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.case, args.profile, args.scale)
+    print(f"{'case':42} {'profile':14} {'scale':7} {'time (s)':>9} {'trials/s':>12} {'peak RSS (MB)':>14}")
+    for r in results:
+        print(f"{r['case']:42} {r['profile']:14} {r['scale']:7} {r['wall_time']:9.3f} {r['trials_per_second']:12.3g} {r['peak_rss_mb']:14.1f}")
+
+    failed = False
+    history = load_history(args.history)
+    for result, baseline in find_regressions(results, history, args.threshold):
+        failed = True
+        print(f"REGRESSION {result['case']} [{result['profile']}, {result['scale']}]: "
+              f"{result['wall_time']:.3f}s vs median {baseline:.3f}s")
+
+    if not args.skip_equivalence:
+        for check, z in equivalence_checks():
+            status = "ok" if abs(z) <= args.z_limit else "MISMATCH"
+            failed = failed or status != "ok"
+            print(f"{status:8} {check}: z = {z:+.2f}")
+
+    if not args.no_record:
+        history.append({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "results": results,
+        })
+        save_history(args.history, history)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
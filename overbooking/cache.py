@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, fields
+
+import numpy as np
+
+from .engine import engine_version, kernel_version
+from .revenue import BumpStatistics, booking_level_sweep, bump_statistics
+
+# Cache directory (override with OVERBOOKING_CACHE_DIR) and default size bound
+default_cache_dir = os.environ.get(
+    "OVERBOOKING_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".overbooking_cache"),
+)
+default_max_bytes = 512 * 1024 ** 2
+
+# Bumped whenever the key payload changes, so entries stored under old keys are never hit
+key_version = 2
+
+
+# Whether a seed names a reproducible stream that a key can capture: an int or a SeedSequence.
+# None (fresh entropy) and Generators (hidden, advancing state) are not.
+def reproducible_seed(seed):
+    return (isinstance(seed, (int, np.integer)) and not isinstance(seed, bool)) or isinstance(seed, np.random.SeedSequence)
+
+
+# Content address of a result: hash of its kind, parameters and the engine/kernel versions.
+# seed must be None, an int or a SeedSequence; values JSON cannot encode raise TypeError rather
+# than being stringified (two Generators would otherwise share a key).
+def cache_key(kind, **params):
+    payload = {"kind": kind, "key_version": key_version, "engine_version": engine_version,
+               "kernel_version": kernel_version}
+    for name, value in params.items():
+        if name == "seed" and value is not None:
+            if not reproducible_seed(value):
+                raise TypeError(f"Cannot key a {type(value).__name__} seed; pass an int or a SeedSequence")
+            if isinstance(value, np.random.SeedSequence):
+                value = {"entropy": np.asarray(value.entropy).tolist(), "spawn_key": list(value.spawn_key),
+                         "pool_size": value.pool_size}
+            else:
+                value = int(value)
+        elif hasattr(value, "__dataclass_fields__"):
+            value = asdict(value)
+        elif isinstance(value, range):
+            value = [value.start, value.stop, value.step]
+        elif isinstance(value, (np.ndarray, np.generic)):
+            value = value.tolist()
+        payload[name] = value
+    encoded = json.dumps(payload, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# Size-bounded on-disk store of named arrays (.npz per key). Hits refresh the file's
+# modification time and the least recently used files are evicted past max_bytes.
+class ResultCache:
+    def __init__(self, directory=default_cache_dir, max_bytes=default_max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                result = {name: data[name] for name in data.files}
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        os.utime(path)
+        return {name: value.item() if value.ndim == 0 else value for name, value in result.items()}
+
+    def put(self, key, arrays):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    # Drop least recently used entries until the cache fits in max_bytes
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                os.remove(os.path.join(self.directory, name))
+
+    # Cached result of compute() (a dict of arrays/scalars) for the given kind and parameters
+    def cached(self, kind, compute, **params):
+        key = cache_key(kind, **params)
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+# booking_level_sweep through the cache. Monte Carlo (and kernel) runs without an int or SeedSequence
+# seed (None or a Generator) are not reproducible, so they are always recomputed.
+def cached_booking_level_sweep(profile, booking_levels, num_simulations=1000, seed=None, method="monte_carlo",
+                               num_workers=1, cache=None):
+    def compute():
+        return booking_level_sweep(profile, booking_levels, num_simulations, seed, method, num_workers)
+
+    if method != "exact" and not reproducible_seed(seed):
+        return compute()
+    if method == "exact":
+        num_simulations = seed = None
+    cache = cache or get_default_cache()
+    return cache.cached("booking_level_sweep", compute, profile=profile, booking_levels=list(booking_levels),
+                        num_simulations=num_simulations, seed=seed, method=method)
+
+
+# bump_statistics through the cache, so fare and compensation what-ifs can be re-scored
+# (revenue.rescore) across sessions without re-simulating
+def cached_bump_statistics(profile, booking_levels, num_simulations=1000, seed=None, method="monte_carlo",
+                           num_workers=1, cache=None):
+    def compute():
+        stats = bump_statistics(profile, booking_levels, num_simulations, seed, method, num_workers)
+        return {field.name: getattr(stats, field.name) for field in fields(stats)}
+
+    if method != "exact" and not reproducible_seed(seed):
+        return BumpStatistics(**compute())
+    if method == "exact":
+        num_simulations = seed = None
+    cache = cache or get_default_cache()
+    return BumpStatistics(**cache.cached("bump_statistics", compute, seats_per_flight=profile.seats_per_flight,
+                                         no_show_rate=profile.no_show_rate, num_flights=profile.num_flights,
+                                         booking_levels=list(booking_levels), num_simulations=num_simulations,
+                                         seed=seed, method=method))
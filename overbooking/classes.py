@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytic import binomial_pmf
+from .compensation import clv_cases, exact_expected_costs
+from .engine import make_rng
+
+# Largest (trials x flights) block of uniforms drawn at once (small enough for the per-flight
+# temporaries to stay in cache)
+max_block_elements = 250_000
+
+# Denied boarding compensation: a multiple of the one-way fare, capped
+dbc_fare_multiple = 4
+dbc_cap = 2150
+
+
+# Who gets bumped and what it costs, per fare class (economy, business, first).
+# Economy passengers who show up are offered money to give up their seat. A volunteer_share of them
+# would consider it, each accepting once the offer reaches their reservation price, min_offer plus
+# an exponential with mean auction_scale (the auction curve). The offer rises until enough volunteers
+# accept or it reaches max_offer; every volunteer is paid the clearing offer plus their loyalty loss.
+# Whoever is still over capacity is bumped involuntarily in involuntary_order at the class's cost.
+@dataclass(frozen=True)
+class ClassBumpModel:
+    no_show_rates: tuple  # Economy, business, first
+    involuntary_costs: tuple  # Cost per involuntarily bumped passenger by class (DBC + loyalty loss)
+    voluntary_loyalty_cost: float  # Loyalty loss per (economy) volunteer
+    min_offer: float  # First offer made to volunteers
+    auction_scale: float  # Mean reservation price above min_offer
+    max_offer: float  # Highest voluntary offer before bumping involuntarily
+    volunteer_share: float = 0.10  # Share of economy passengers open to volunteering
+    involuntary_order: tuple = (0, 1, 2)  # Classes bumped first to last
+
+    # Costs from the CLV loyalty-loss model of the route (Compensation/Long_term_cost.py; route
+    # defaults to profile.route), scaled per class by clv_multipliers (default: the fare multipliers),
+    # plus denied boarding compensation of dbc_fare_multiple x fare capped at dbc_cap. By default the
+    # airline offers volunteers up to what an involuntary economy bump would cost.
+    @classmethod
+    def from_profile(cls, profile, no_show_rates=None, route=None, clv_multipliers=None, min_offer=None,
+                     auction_scale=None, max_offer=None, volunteer_share=0.10, involuntary_order=(0, 1, 2)):
+        route = route or profile.route
+        routes = sorted({case['route'] for case in clv_cases.values()})
+        if route is None:
+            raise ValueError(f"Profile {profile.name!r} has no route; pass route= (one of {routes})")
+        if route not in routes:
+            raise ValueError(f"Unknown route: {route!r} (expected one of {routes})")
+        cases = {label: case for label, case in clv_cases.items() if case['route'] == route}
+        loyalty = exact_expected_costs(cases)
+        involuntary_loyalty = next(cost for label, cost in loyalty.items() if label.endswith(" - Involuntary"))
+        voluntary_loyalty = next(cost for label, cost in loyalty.items() if label.endswith(" - Voluntary"))
+
+        fares = np.array([profile.economy_price, profile.business_price, profile.first_price])
+        if clv_multipliers is None:
+            clv_multipliers = (1, profile.business_multiplier, profile.first_multiplier)
+        denied_boarding = np.minimum(dbc_fare_multiple * fares, dbc_cap)
+        involuntary = denied_boarding + involuntary_loyalty * np.asarray(clv_multipliers, dtype=float)
+
+        if no_show_rates is None:
+            no_show_rates = (profile.no_show_rate,) * 3
+        if min_offer is None:
+            min_offer = profile.economy_price
+        if auction_scale is None:
+            auction_scale = 2 * profile.economy_price
+        if max_offer is None:
+            max_offer = max(min_offer, involuntary[0] - voluntary_loyalty)
+        return cls(tuple(float(r) for r in no_show_rates), tuple(float(c) for c in involuntary), float(voluntary_loyalty),
+                   float(min_offer), float(auction_scale), float(max_offer), float(volunteer_share),
+                   tuple(involuntary_order))
+
+
+# Volunteers, clearing offer and involuntary bumps by class for bumped flights only.
+# overbooked, willing (n,) -> (volunteers (n,), offer (n,), short, involuntary (len(short), 3)) where
+# short indexes the flights without enough volunteers, the only ones that need a class split
+def _allocate_bumps(overbooked, willing, seats, model, tables, rng):
+    volunteers = np.minimum(overbooked, willing)
+
+    # Enough volunteers: the offer clears at the overbooked-th lowest reservation price among them,
+    # a Beta order statistic mapped through the auction curve truncated at max_offer
+    accept_at_max = -np.expm1(-(model.max_offer - model.min_offer) / model.auction_scale)
+    enough = willing >= overbooked
+    short = np.flatnonzero(~enough)
+    needed = overbooked[enough]
+    order = rng.beta(needed, willing[enough] - needed + 1)
+    offer = np.full(len(overbooked), model.max_offer)
+    offer[enough] = model.min_offer - model.auction_scale * np.log1p(-accept_at_max * order)
+
+    # Everyone else is bumped involuntarily, class by class. Economy show-ups given (total, willing)
+    # and first given business + first complete the split of these flights only.
+    overbooked, willing = overbooked[short], willing[short]
+    total, remaining = seats + overbooked, overbooked - willing
+    u = rng.random((len(short), 2))
+    cell = (overbooked - 1) * tables["width"] + willing
+    cells = np.flatnonzero(np.bincount(cell))
+    row = np.searchsorted(cells, cell)
+    rows, columns = np.divmod(cells, tables["width"])
+    economy_given = tables["economy"][rows] * tables["willing"][:, columns].T
+    economy = tables["economy_low"] + _draw_rows(_flat_cdf(economy_given), row, u[:, 0])
+    first = _draw_rows(tables["first"], total - economy, u[:, 1])
+    left = np.stack((economy - willing, total - economy - first, first), axis=1)
+
+    ordered = left[:, list(model.involuntary_order)]
+    before = np.cumsum(ordered, axis=1) - ordered
+    taken = np.clip(remaining[:, None] - before, 0, ordered)
+    involuntary = np.zeros_like(taken)
+    involuntary[:, list(model.involuntary_order)] = taken
+    return volunteers, offer, short, involuntary
+
+
+# Inverse-CDF tables for tickets per class. A flight's single uniform u gives its total show-ups
+# (bumped once u >= no_bump, P(total <= seats)) and, above capacity, its willing volunteers: "joint"
+# is the distribution of (total, willing) pairs given total > seats, flattened total-major with rows
+# of "width", drawn from (u - no_bump) / (1 - no_bump).
+# P(total, economy) and P(willing | economy) give economy show-ups (from "economy_low") given
+# (total, willing), and "first" first class given business + first, for the flights without enough
+# volunteers. Above capacity economy is within business + first of the total, so only that band of
+# economy counts is tabulated.
+def _class_tables(tickets, show_rates, seats, model):
+    economy, business, first = (binomial_pmf(int(n), p) for n, p in zip(tickets, show_rates))
+    business_first = np.convolve(business, first)
+    total = np.convolve(economy, business_first)
+    first_given_rest = first * _shifted(business, np.arange(len(business_first)), np.arange(len(first)))
+    tables = {"no_bump": 1.0, "joint": None, "first": _flat_cdf(first_given_rest)}
+    totals = np.arange(seats + 1, len(total))
+    if not totals.size:
+        return tables
+
+    # P(total = t, economy = e) for t above seats, and P(willing = w | economy = e)
+    economy_low = max(0, seats + 2 - len(business_first))
+    economies = np.arange(economy_low, len(economy))
+    total_economy = economy[economies] * _shifted(business_first, totals, economies)
+    accept_at_max = -np.expm1(-(model.max_offer - model.min_offer) / model.auction_scale)
+    willing = binomial_pmf(economies, model.volunteer_share * accept_at_max)
+    tables.update({
+        "no_bump": total[:seats + 1].sum(),
+        "joint": _flat_cdf((total_economy @ willing).reshape(1, -1)),
+        "width": willing.shape[1],
+        "economy": total_economy,
+        "economy_low": economy_low,
+        "willing": willing,
+    })
+    return tables
+
+
+# pmf[t - k] for every t (rows) and k (columns), 0 outside the support
+def _shifted(pmf, t, k):
+    k = t[:, None] - k[None, :]
+    return np.where((k >= 0) & (k < len(pmf)), pmf[np.clip(k, 0, len(pmf) - 1)], 0.0)
+
+
+# Row-normalized CDFs with row r shifted to [r, r + 1] and flattened, plus a guide table
+# (Chen & Asau): guide[r, j] is the first index whose CDF exceeds j / width, so a draw starts
+# next to its answer and only a step or two of scanning is left. Returns (cdf, guide, width, offset).
+def _flat_cdf(weights, offset=0):
+    cdf = np.cumsum(weights, axis=1)
+    norm = cdf[:, -1:]
+    cdf = np.divide(cdf, norm, out=np.zeros_like(cdf), where=norm > 0)
+    cdf[:, -1] = np.where(norm[:, 0] > 0, 1.0, 0.0)
+    rows, width = cdf.shape
+    flat = (cdf + np.arange(rows)[:, None]).ravel()
+    grid = np.arange(rows)[:, None] + np.arange(width) / width
+    guide = np.searchsorted(flat, grid.ravel(), side='right')
+    return flat, np.minimum(guide, np.repeat(np.arange(1, rows + 1) * width - 1, width)), width, offset
+
+
+# Inverse-CDF draw from the conditional row of every element: the first index whose CDF exceeds u
+def _draw_rows(table, rows, u):
+    flat, guide, width, offset = table
+    row = rows - offset
+    target = row + u
+    position = guide[row * width + (u * width).astype(np.int64)]
+    behind = np.flatnonzero(flat[position] <= target)
+    while behind.size:
+        position[behind] += 1
+        behind = behind[flat[position[behind]] <= target[behind]]
+    return position - row * width
+
+
+# Net revenue per flight at one booking level with per-class show-ups (separate no-show rates)
+# and bump costs from model, vectorized over (trials, flights). One uniform per flight gives its
+# total show-ups and, above capacity, its willing volunteers (inverse CDF of the exact class
+# convolution); flights over capacity go through the volunteer auction (one Beta draw), and only
+# those without enough volunteers draw a class split for their involuntary bumps. Returns
+# per-flight averages, with involuntary bumps split by class.
+def simulate_class_bumps(profile, booked_per_flight, model, num_simulations=1000, rng=None):
+    rng = make_rng(rng)
+    num_flights = profile.num_flights
+    seats = profile.seats_per_flight
+    # Passengers left over by the truncating class split fly economy, so show-ups match booked_per_flight
+    tickets = np.array([int(t) for t in profile.ticket_counts(booked_per_flight)], dtype=np.int64)
+    tickets[0] += booked_per_flight - tickets.sum()
+    tables = _class_tables(tickets, 1 - np.asarray(model.no_show_rates), seats, model)
+    no_bump = tables["no_bump"]
+    involuntary_costs = np.asarray(model.involuntary_costs)
+
+    bump_cost = np.zeros(num_simulations)
+    overbooked_total = np.zeros(num_simulations)
+    volunteers_total = 0
+    offers_total = 0.0
+    involuntary_total = np.zeros(3)
+
+    # At or below capacity no flight is ever bumped
+    block_size = max(1, max_block_elements // num_flights)
+    for start in range(0, num_simulations if tables["joint"] is not None else 0, block_size):
+        size = min(block_size, num_simulations - start)
+        u = rng.random(size * num_flights)
+        bumped = np.flatnonzero(u >= no_bump)
+        trial = bumped // num_flights
+
+        # Total show-ups and willing volunteers from the flight's uniform
+        cell = _draw_rows(tables["joint"], 0, (u[bumped] - no_bump) / (1 - no_bump))
+        overbooked, willing = np.divmod(cell, tables["width"])
+        overbooked += 1
+
+        volunteers, offer, short, involuntary = _allocate_bumps(overbooked, willing, seats, model, tables, rng)
+        cost = volunteers * (offer + model.voluntary_loyalty_cost)
+        cost[short] += involuntary @ involuntary_costs
+        bump_cost[start:start + size] = np.bincount(trial, weights=cost, minlength=size)
+        overbooked_total[start:start + size] = np.bincount(trial, weights=overbooked, minlength=size)
+        volunteers_total += volunteers.sum()
+        offers_total += (volunteers * offer).sum()
+        involuntary_total += involuntary.sum(axis=0)
+
+    net_revenue = profile.ticket_revenue(booked_per_flight) - bump_cost / num_flights
+    flight_days = num_simulations * num_flights
+    return {
+        "avg_net_revenue": float(np.mean(net_revenue)),
+        "std_net_revenue": float(np.std(net_revenue, ddof=1)) if num_simulations > 1 else 0.0,
+        "avg_overbooked_passengers": float(np.mean(overbooked_total) / num_flights),
+        "avg_bump_cost": float(np.mean(bump_cost) / num_flights),
+        "avg_volunteers": float(volunteers_total / flight_days),
+        "avg_involuntary": involuntary_total / flight_days,
+        "avg_offer": float(offers_total / volunteers_total) if volunteers_total else 0.0,
+    }
+
+
+# Net revenue curve over booking levels under the class-aware bump model, in the same form as
+# revenue.booking_level_sweep (so plots.plot_booking_levels works unchanged)
+def class_booking_level_sweep(profile, booking_levels, model, num_simulations=1000, seed=None):
+    rng = make_rng(seed)
+    booking_levels = np.asarray(list(booking_levels))
+    results = [simulate_class_bumps(profile, b, model, num_simulations, rng) for b in booking_levels]
+    avg_net_revenue = np.array([r["avg_net_revenue"] for r in results])
+    best = int(np.argmax(avg_net_revenue))
+    return {
+        "booking_levels": booking_levels,
+        "avg_net_revenue": avg_net_revenue,
+        "std_net_revenue": np.array([r["std_net_revenue"] for r in results]),
+        "avg_overbooked_passengers": np.array([r["avg_overbooked_passengers"] for r in results]),
+        "avg_volunteers": np.array([r["avg_volunteers"] for r in results]),
+        "avg_involuntary": np.array([r["avg_involuntary"] for r in results]),
+        "best_booking_level": int(booking_levels[best]),
+        "best_revenue": float(avg_net_revenue[best]),
+    }
@@ -0,0 +1,99 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from .engine import make_rng
+
+# Triangular distribution parameters (min, mode, max hours) for delay by route type
+tri_params = {
+    'domestic': (1, 2, 6),
+    'international': (4, 8, 24)
+}
+
+# Loyalty-loss cases of Compensation/Long_term_cost.py
+clv_cases = {
+    "Domestic - Involuntary":     {'route': 'domestic',     'L': 1, 'k': 0.5, 'h0': 0,  'clv': 2500},
+    "Domestic - Voluntary":       {'route': 'domestic',     'L': 1, 'k': 0.5, 'h0': 4,  'clv': 2500},
+    "International - Involuntary":{'route': 'international','L': 1, 'k': 0.3, 'h0': 0,  'clv': 7125},
+    "International - Voluntary":  {'route': 'international','L': 1, 'k': 0.3, 'h0': 12, 'clv': 7125},
+}
+
+# Largest (cases x passengers) block of delays drawn at once
+max_block_elements = 4_000_000
+
+# Gauss-Legendre nodes used on each linear piece of the triangular PDF
+quadrature_points = 64
+
+
+# Logistic loyalty loss rate for a delay of h hours (works on arrays)
+def logistic_loyalty_loss(h, L, k, h0):
+    return L / (1 + np.exp(-k * (h - h0)))
+
+
+# Case parameters as arrays, one entry per case: a, b, c, L, k, h0, clv
+def case_arrays(cases):
+    params = list(cases.values())
+    tri = np.array([tri_params[p['route']] for p in params], dtype=float).reshape(-1, 3)
+    L = np.array([p['L'] for p in params], dtype=float)
+    k = np.array([p['k'] for p in params], dtype=float)
+    h0 = np.array([p['h0'] for p in params], dtype=float)
+    clv = np.array([p['clv'] for p in params], dtype=float)
+    return tri[:, 0], tri[:, 1], tri[:, 2], L, k, h0, clv
+
+
+# Monte Carlo expected loyalty-loss cost per bumped passenger for every case at once.
+# Delays for all cases are drawn as one (cases, passengers) array per block; returns
+# {label: {"mean_cost", "std_error", "ci_low", "ci_high"}}.
+def simulate_expected_costs(cases, n_passengers=100_000, rng=None, confidence=0.95):
+    rng = make_rng(rng)
+    a, b, c, L, k, h0, clv = case_arrays(cases)
+    num_cases = len(a)
+
+    total = np.zeros(num_cases)
+    total_sq = np.zeros(num_cases)
+    cases_per_block = max(1, min(num_cases, max_block_elements // n_passengers))
+    passengers_per_block = max(1, min(n_passengers, max_block_elements // cases_per_block))
+
+    for start in range(0, num_cases, cases_per_block):
+        rows = slice(start, start + cases_per_block)
+        for done in range(0, n_passengers, passengers_per_block):
+            size = min(passengers_per_block, n_passengers - done)
+            delay = rng.triangular(a[rows, None], b[rows, None], c[rows, None], size=(len(a[rows]), size))
+            cost = clv[rows, None] * logistic_loyalty_loss(delay, L[rows, None], k[rows, None], h0[rows, None])
+            total[rows] += cost.sum(axis=1)
+            total_sq[rows] += (cost ** 2).sum(axis=1)
+
+    mean = total / n_passengers
+    variance = np.maximum(0.0, (total_sq - n_passengers * mean ** 2) / max(1, n_passengers - 1))
+    std_error = np.sqrt(variance / n_passengers)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    return {
+        label: {
+            "mean_cost": mean[i],
+            "std_error": std_error[i],
+            "ci_low": mean[i] - z * std_error[i],
+            "ci_high": mean[i] + z * std_error[i],
+        }
+        for i, label in enumerate(cases)
+    }
+
+
+# Exact expected cost: clv * integral of the logistic loss against the triangular PDF.
+# The PDF is linear on [a, b] and [b, c], so each piece is integrated with Gauss-Legendre.
+def exact_expected_costs(cases):
+    a, b, c, L, k, h0, clv = case_arrays(cases)
+    nodes, weights = np.polynomial.legendre.leggauss(quadrature_points)
+
+    expected = np.zeros(len(a))
+    for low, high in ((a, b), (b, c)):
+        half = (high - low) / 2
+        h = (low + high)[:, None] / 2 + half[:, None] * nodes
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pdf = np.where(h < b[:, None],
+                           2 * (h - a[:, None]) / ((c - a) * (b - a))[:, None],
+                           2 * (c[:, None] - h) / ((c - a) * (c - b))[:, None])
+        integrand = logistic_loyalty_loss(h, L[:, None], k[:, None], h0[:, None]) * pdf
+        expected += np.where(half > 0, half * (integrand @ weights), 0.0)
+
+    return dict(zip(cases, clv * expected))
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytic import binomial_pmf, range_stats_from_daily_pmf
+from .engine import lower_bound, make_rng, overbooking_range_stats, upper_bound
+
+# Gauss-Hermite nodes used to integrate over the day-level shock
+default_quadrature_nodes = 32
+
+
+# No-show model with correlation inside a flight and across a day.
+# Each day draws a shock Z ~ N(0, 1) shared by every flight, moving the show-up rate on the
+# logit scale: logit(p_day) = logit(1 - no_show_rate) + day_sigma * Z. Each flight then draws
+# its own show-up rate from a Beta with mean p_day and intra-flight correlation
+# flight_correlation (beta-binomial show-ups). Both at 0 gives the independent binomial model.
+@dataclass(frozen=True)
+class NoShowModel:
+    no_show_rate: float
+    flight_correlation: float = 0.0  # Correlation between two passengers' show-ups on a flight
+    day_sigma: float = 0.0  # Std. dev. of the daily shock on the logit scale
+
+    @classmethod
+    def from_profile(cls, profile, flight_correlation=0.0, day_sigma=0.0):
+        return cls(profile.no_show_rate, flight_correlation, day_sigma)
+
+    # Show-up rate for day shocks z (p_day above)
+    def day_show_rate(self, z):
+        logit = np.log1p(-self.no_show_rate) - np.log(self.no_show_rate)
+        return 1 / (1 + np.exp(-(logit + self.day_sigma * np.asarray(z, dtype=float))))
+
+    # Day shocks and probability weights for integrating over Z (a single node without a day effect)
+    def quadrature(self, nodes=default_quadrature_nodes):
+        if self.day_sigma == 0:
+            return np.zeros(1), np.ones(1)
+        z, weights = np.polynomial.hermite_e.hermegauss(nodes)
+        return z, weights / weights.sum()
+
+
+# Beta-binomial PMF over k = 0..n on the last axis, for show-up mean and intra-flight correlation rho.
+# Built in log space from the ratio recurrence P(k+1)/P(k) = (n-k)(k+a) / ((k+1)(n-k-1+b)).
+def beta_binomial_pmf(n, mean, rho):
+    mean = np.asarray(mean, dtype=float)
+    if rho == 0:
+        return binomial_pmf(n, mean)
+    a = (mean * (1 - rho) / rho)[..., None]
+    b = ((1 - mean) * (1 - rho) / rho)[..., None]
+    i = np.arange(n)
+
+    log_p0 = np.sum(np.log(b + i) - np.log(a + b + i), axis=-1, keepdims=True)
+    log_ratio = np.log(n - i) - np.log(i + 1) + np.log(i + a) - np.log(n - i - 1 + b)
+    log_pmf = np.concatenate((log_p0, log_p0 + np.cumsum(log_ratio, axis=-1)), axis=-1)
+    pmf = np.exp(log_pmf)
+    return pmf / pmf.sum(axis=-1, keepdims=True)
+
+
+# PMF of overbooked passengers on one flight for every day shock z: shape (len(z), max(1, booked - seats + 1))
+def _flight_overbooked_pmfs(booked_per_flight, seats, model, z):
+    shows = beta_binomial_pmf(booked_per_flight, model.day_show_rate(z), model.flight_correlation)
+    if booked_per_flight <= seats:
+        return np.ones((len(z), 1))
+    bumps = shows[:, seats:].copy()
+    bumps[:, 0] = shows[:, :seats + 1].sum(axis=-1)
+    return bumps
+
+
+# Expected overbooked passengers per flight under the model
+def expected_overbooked(booked_per_flight, seats, model, nodes=default_quadrature_nodes):
+    z, weights = model.quadrature(nodes)
+    single = _flight_overbooked_pmfs(booked_per_flight, seats, model, z)
+    return float(weights @ (single @ np.arange(single.shape[-1])))
+
+
+# PMF of total overbooked passengers in a day of num_flights flights. Flights are independent
+# given the day shock, so each node's flight PMF is raised to num_flights by FFT and the nodes
+# are mixed with their Gauss-Hermite weights.
+def daily_overbooked_pmf(booked_per_flight, seats, model, num_flights, nodes=default_quadrature_nodes):
+    z, weights = model.quadrature(nodes)
+    single = _flight_overbooked_pmfs(booked_per_flight, seats, model, z)
+    support = num_flights * (single.shape[-1] - 1) + 1
+
+    size = 1 << int(np.ceil(np.log2(support)))
+    daily = np.fft.irfft(np.fft.rfft(single, size, axis=-1) ** num_flights, size, axis=-1)[:, :support]
+    daily = np.clip(daily, 0.0, None)
+    daily /= daily.sum(axis=-1, keepdims=True)
+    return weights @ daily
+
+
+# Probability that a day has at least min_overbooked overbooked passengers
+def daily_tail_probability(booked_per_flight, seats, model, num_flights, min_overbooked,
+                           nodes=default_quadrature_nodes):
+    daily = daily_overbooked_pmf(booked_per_flight, seats, model, num_flights, nodes)
+    return float(daily[int(np.ceil(min_overbooked)):].sum())
+
+
+# Total overbooked passengers per simulated day under the model; like
+# engine.simulate_overbooked_per_day, a list of levels returns (levels, num_simulations).
+# Day shocks and flight show-up rates are shared across levels (common random numbers).
+def simulate_overbooked_per_day(booked_per_flight, seats, model, num_flights, num_simulations, rng=None):
+    rng = make_rng(rng)
+    booked = np.asarray(booked_per_flight)
+
+    p_day = model.day_show_rate(rng.standard_normal((num_simulations, 1)) if model.day_sigma else np.zeros((num_simulations, 1)))
+    rho = model.flight_correlation
+    if rho > 0:
+        p_flight = rng.beta(p_day * (1 - rho) / rho, (1 - p_day) * (1 - rho) / rho, size=(num_simulations, num_flights))
+    else:
+        p_flight = np.broadcast_to(p_day, (num_simulations, num_flights))
+
+    show_up = rng.binomial(booked.reshape(booked.shape + (1, 1)), p_flight)
+    return np.maximum(0, show_up - seats).sum(axis=-1)
+
+
+# Range statistics for every strategy in {name: booked_per_flight} under a correlated model.
+# method="exact" uses the Gauss-Hermite/FFT daily PMF, "monte_carlo" samples the model.
+def correlated_range_stats(booking_levels, seats, model, num_flights, num_simulations=1000, rng=None,
+                           lower_bound=lower_bound, upper_bound=upper_bound, method="exact",
+                           nodes=default_quadrature_nodes):
+    if method == "exact":
+        return {strategy: range_stats_from_daily_pmf(daily_overbooked_pmf(booked, seats, model, num_flights, nodes),
+                                                     expected_overbooked(booked, seats, model, nodes),
+                                                     booked, num_flights, lower_bound, upper_bound)
+                for strategy, booked in booking_levels.items()}
+    if method != "monte_carlo":
+        raise ValueError(f"Unknown method: {method}")
+
+    strategies = list(booking_levels.keys())
+    levels = [booking_levels[s] for s in strategies]
+    overbooked_per_day = simulate_overbooked_per_day(levels, seats, model, num_flights, num_simulations, rng)
+    return {strategy: overbooking_range_stats(per_day, booked, num_flights, lower_bound, upper_bound)
+            for strategy, booked, per_day in zip(strategies, levels, overbooked_per_day)}
@@ -0,0 +1,101 @@
+import numpy as np
+
+# Bumped whenever sampling changes results for the same seed (part of cache keys)
+engine_version = 1
+
+# Same for the counter-based stream and kernels of overbooking.kernels (method="kernel")
+kernel_version = 1
+
+# Acceptable share of booked passengers getting overbooked in a day (%)
+lower_bound, upper_bound = 0.05, 0.15
+
+
+# Seedable random generator (accepts a seed, a SeedSequence or an existing Generator)
+def make_rng(seed=None):
+    return np.random.default_rng(seed)
+
+
+# Total overbooked passengers per simulated day for one or several booking levels.
+# A scalar booking level returns shape (num_simulations,), a list of levels
+# returns shape (len(levels), num_simulations) drawn in a single batched call.
+def simulate_overbooked_per_day(booked_per_flight, seats, no_show_rate, num_flights, num_simulations, rng=None):
+    rng = make_rng(rng)
+    booked = np.asarray(booked_per_flight)
+
+    # Show-up matrix (levels, num_simulations, num_flights)
+    show_up = rng.binomial(booked.reshape(booked.shape + (1, 1)), 1 - no_show_rate,
+                           size=booked.shape + (num_simulations, num_flights))
+
+    # Number of overbooked passengers per flight, summed over the day
+    overbooked = np.maximum(0, show_up - seats)
+    return overbooked.sum(axis=-1)
+
+
+# Daily overbooked counts a range covers, with the comparisons of overbooking_range_stats (rates
+# in % of booked passengers): (smallest count >= lower_bound, largest count <= upper_bound)
+def range_counts(booked_per_flight, num_flights, lower_bound=lower_bound, upper_bound=upper_bound):
+    total_passengers_per_day = num_flights * booked_per_flight
+    low = int(np.ceil(lower_bound / 100 * total_passengers_per_day))
+    while low > 0 and (low - 1) / total_passengers_per_day * 100 >= lower_bound:
+        low -= 1
+    while low / total_passengers_per_day * 100 < lower_bound:
+        low += 1
+    high = int(np.floor(upper_bound / 100 * total_passengers_per_day))
+    while high / total_passengers_per_day * 100 > upper_bound:
+        high -= 1
+    while (high + 1) / total_passengers_per_day * 100 <= upper_bound:
+        high += 1
+    return low, high
+
+
+# Range probabilities and overbooking rate from the simulated daily totals
+def overbooking_range_stats(overbooked_passengers_per_day, booked_per_flight, num_flights,
+                            lower_bound=lower_bound, upper_bound=upper_bound):
+    overbooked_passengers_per_day = np.asarray(overbooked_passengers_per_day)
+    total_passengers_per_day = num_flights * booked_per_flight
+    overbooking_rate_per_passenger = overbooked_passengers_per_day / total_passengers_per_day * 100
+
+    prob_within_range = np.mean((overbooking_rate_per_passenger >= lower_bound) & (overbooking_rate_per_passenger <= upper_bound))
+    prob_above_range = np.mean(overbooking_rate_per_passenger > upper_bound)
+    prob_below_range = np.mean(overbooking_rate_per_passenger < lower_bound)
+    avg_overbooking_rate = np.mean(overbooking_rate_per_passenger)
+
+    # "1 in X passengers get overbooked"
+    if avg_overbooking_rate > 0:
+        one_in_x_passengers = round(1 / (avg_overbooking_rate / 100))
+    else:
+        one_in_x_passengers = None
+
+    return {
+        "prob_within_range": prob_within_range * 100,
+        "prob_above_range": prob_above_range * 100,
+        "prob_below_range": prob_below_range * 100,
+        "avg_overbooking_rate": avg_overbooking_rate,
+        "one_in_x_passengers": one_in_x_passengers,
+    }
+
+
+# Range statistics for every strategy in {name: booked_per_flight}, all levels drawn at once.
+# method="exact" computes the same statistics from the binomial distribution instead of sampling,
+# method="kernel" samples with the fused kernels of overbooking.kernels.
+def simulate_strategies(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng=None,
+                        lower_bound=lower_bound, upper_bound=upper_bound, method="monte_carlo"):
+    if method == "exact":
+        from .analytic import exact_range_stats
+        return {strategy: exact_range_stats(booked_per_flight, seats, no_show_rate, num_flights, lower_bound, upper_bound)
+                for strategy, booked_per_flight in booking_levels.items()}
+    if method not in ("monte_carlo", "kernel"):
+        raise ValueError(f"Unknown method: {method}")
+
+    strategies = list(booking_levels.keys())
+    levels = [booking_levels[s] for s in strategies]
+    if method == "kernel":
+        from .kernels import kernel_overbooked_per_day
+        overbooked_per_day = kernel_overbooked_per_day(levels, seats, no_show_rate, num_flights, num_simulations, rng)
+    else:
+        overbooked_per_day = simulate_overbooked_per_day(levels, seats, no_show_rate, num_flights, num_simulations, rng)
+
+    results = {}
+    for strategy, booked_per_flight, per_day in zip(strategies, levels, overbooked_per_day):
+        results[strategy] = overbooking_range_stats(per_day, booked_per_flight, num_flights, lower_bound, upper_bound)
+    return results
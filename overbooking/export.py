@@ -0,0 +1,202 @@
+import json
+import os
+from dataclasses import asdict, fields, is_dataclass
+
+import numpy as np
+
+from .engine import engine_version
+from .parallel import default_chunk_size, iter_levels_parallel
+
+# Written last, so a directory with a manifest always has complete columns
+manifest_name = "manifest.json"
+
+# Parquet output (file_format="parquet"): one file, one row group per written block
+parquet_name = "table.parquet"
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow); use file_format='npy'") from exc
+    return pyarrow
+
+
+# JSON-safe scalar (numpy scalars to Python, non-finite floats to None)
+def _scalar(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+# Typed column from per-row values; None becomes NaN
+def _column(values):
+    values = list(values)
+    if any(value is None for value in values):
+        return np.array([np.nan if value is None else value for value in values], dtype=float)
+    return np.asarray(values)
+
+
+# Rows of {key: {stat: value}} as a "key" column plus one column per statistic
+def _table_columns(table, prefix=""):
+    keys = list(table)
+    columns = {f"{prefix}key": _column(keys)}
+    for stat in table[keys[0]]:
+        columns[f"{prefix}{stat}"] = _column(table[key][stat] for key in keys)
+    return columns
+
+
+def _is_table(value):
+    return isinstance(value, dict) and bool(value) and all(isinstance(row, dict) for row in value.values())
+
+
+# Split an entry point's result into typed columns and scalar metadata.
+# * {name: {stat: value}} (strategy/level tables) -> a "key" column plus one column per statistic
+# * {name: scalar} (e.g. simulate_strategy_revenues) -> "key" and "value" columns
+# * anything else (sweeps, simulators, dataclasses such as BumpStatistics) -> arrays become columns,
+#   scalars metadata and nested tables columns prefixed "name." (overbooking_level_sweep's "results")
+def result_columns(result):
+    if is_dataclass(result):
+        result = {field.name: getattr(result, field.name) for field in fields(result)}
+    if not isinstance(result, dict):
+        raise TypeError(f"Cannot export a {type(result).__name__}; expected a result dict or dataclass")
+    if _is_table(result):
+        return _table_columns(result), {}
+    if result and all(np.ndim(value) == 0 and not isinstance(value, dict) for value in result.values()):
+        return {"key": _column(result), "value": _column(result.values())}, {}
+
+    columns, metadata = {}, {}
+    for name, value in result.items():
+        if _is_table(value):
+            columns.update(_table_columns(value, prefix=f"{name}."))
+        elif isinstance(value, (list, tuple, np.ndarray)):
+            columns[name] = np.asarray(value)
+        else:
+            metadata[name] = _scalar(value)
+    return columns, metadata
+
+
+# Manifest: what the directory holds, how each column is stored and the run's parameters
+def _write_manifest(directory, kind, file_format, columns, metadata):
+    manifest = {"kind": kind, "format": file_format, "engine_version": engine_version, "columns": columns,
+                "metadata": {name: asdict(value) if is_dataclass(value) else _scalar(value)
+                             for name, value in metadata.items()}}
+    tmp_path = os.path.join(directory, f"{manifest_name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_path, os.path.join(directory, manifest_name))
+
+
+def _column_info(array, file_name):
+    return {"file": file_name, "dtype": np.dtype(array.dtype).str, "shape": list(array.shape)}
+
+
+# Columns as one .npy file each (any shapes), or as one Parquet table (1-D columns of one length)
+def write_columns(directory, columns, kind="results", file_format="npy", **metadata):
+    os.makedirs(directory, exist_ok=True)
+    columns = {name: np.asarray(values) for name, values in columns.items()}
+    if file_format == "parquet":
+        lengths = {len(values) if values.ndim == 1 else -1 for values in columns.values()}
+        if len(lengths) > 1 or -1 in lengths:
+            raise ValueError("Parquet needs 1-D columns of equal length; use file_format='npy'")
+        pa = _pyarrow()
+        tmp_path = os.path.join(directory, f"{parquet_name}.tmp")
+        pa.parquet.write_table(pa.table({name: values for name, values in columns.items()}), tmp_path)
+        os.replace(tmp_path, os.path.join(directory, parquet_name))
+        info = {name: _column_info(values, parquet_name) for name, values in columns.items()}
+    elif file_format == "npy":
+        info = {}
+        for name, values in columns.items():
+            file_name = f"{name}.npy"
+            tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+            np.save(tmp_path, values)
+            os.replace(tmp_path, os.path.join(directory, file_name))
+            info[name] = _column_info(values, file_name)
+    else:
+        raise ValueError(f"Unknown format: {file_format}")
+    _write_manifest(directory, kind, file_format, info, metadata)
+    return os.path.join(directory, manifest_name)
+
+
+# Per-level / per-strategy outputs of any entry point (see result_columns) with its scalars and the
+# run's parameters (profile, seed, method, ...) in the manifest, e.g.
+# export_results("out/sweep", booking_level_sweep(profile, levels, seed=1), profile=profile, seed=1)
+def export_results(directory, result, file_format="npy", **metadata):
+    columns, scalars = result_columns(result)
+    return write_columns(directory, columns, "results", file_format, **scalars, **metadata)
+
+
+# Per-trial outputs of a booking-level sweep: overbooked passengers and net revenue per flight for
+# every (level, simulated day). Draws are the same as bump_statistics / booking_level_sweep for the
+# same seed and chunk_size. Levels are simulated one at a time and written straight into
+# memory-mapped .npy files of shape (levels, trials) (or appended as Parquet row groups in long
+# format), so outputs larger than RAM never have to be held at once.
+def export_trials(directory, profile, booking_levels, num_simulations=1000, seed=None, num_workers=1,
+                  file_format="npy", chunk_size=default_chunk_size):
+    os.makedirs(directory, exist_ok=True)
+    booking_levels = np.asarray(list(booking_levels))
+    ticket_revenue = profile.ticket_revenue(booking_levels)
+    compensation = profile.compensation_per_passenger / profile.num_flights
+    draws = iter_levels_parallel(booking_levels.tolist(), profile.seats_per_flight, profile.no_show_rate,
+                                 profile.num_flights, num_simulations, seed, num_workers, chunk_size)
+    metadata = {"profile": profile, "num_simulations": num_simulations, "seed": seed, "chunk_size": chunk_size}
+
+    if file_format == "npy":
+        shape = (len(booking_levels), num_simulations)
+        dtypes = {"overbooked_per_day": np.int32, "net_revenue": np.float64}
+        arrays = {name: np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode="w+",
+                                                  dtype=dtype, shape=shape)
+                  for name, dtype in dtypes.items()}
+        for i, (_, per_day) in enumerate(draws):
+            arrays["overbooked_per_day"][i] = per_day
+            arrays["net_revenue"][i] = ticket_revenue[i] - compensation * per_day
+        np.save(os.path.join(directory, "booking_levels.npy"), booking_levels)
+        info = {name: _column_info(array, f"{name}.npy") for name, array in arrays.items()}
+        info["booking_levels"] = _column_info(booking_levels, "booking_levels.npy")
+        for array in arrays.values():
+            array.flush()
+    elif file_format == "parquet":
+        pa = _pyarrow()
+        tmp_path = os.path.join(directory, f"{parquet_name}.tmp")
+        trial = np.arange(num_simulations, dtype=np.int32)
+        writer = None
+        for i, (level, per_day) in enumerate(draws):
+            block = pa.table({
+                "booking_level": np.full(num_simulations, level, dtype=np.int32),
+                "trial": trial,
+                "overbooked_per_day": per_day.astype(np.int32),
+                "net_revenue": ticket_revenue[i] - compensation * per_day,
+            })
+            writer = writer or pa.parquet.ParquetWriter(tmp_path, block.schema)
+            writer.write_table(block)
+        if writer is not None:
+            writer.close()
+            os.replace(tmp_path, os.path.join(directory, parquet_name))
+        rows = len(booking_levels) * num_simulations
+        info = {name: {"file": parquet_name, "dtype": np.dtype(dtype).str, "shape": [rows]}
+                for name, dtype in (("booking_level", np.int32), ("trial", np.int32),
+                                    ("overbooked_per_day", np.int32), ("net_revenue", np.float64))}
+    else:
+        raise ValueError(f"Unknown format: {file_format}")
+
+    _write_manifest(directory, "trials", file_format, info, metadata)
+    return os.path.join(directory, manifest_name)
+
+
+# Columns and manifest of an exported directory. .npy columns are memory-mapped (mmap_mode='r'),
+# so slicing reads only the touched pages and nothing is copied; Parquet columns are read through
+# a memory-mapped file (zero-copy where Arrow allows). Returns (columns, manifest).
+def load_results(directory, mmap_mode='r'):
+    with open(os.path.join(directory, manifest_name)) as f:
+        manifest = json.load(f)
+    if manifest["format"] == "parquet":
+        pa = _pyarrow()
+        table = pa.parquet.read_table(os.path.join(directory, parquet_name), memory_map=True)
+        columns = {name: table.column(name).to_numpy() for name in manifest["columns"]}
+    else:
+        columns = {name: np.load(os.path.join(directory, info["file"]), mmap_mode=mmap_mode)
+                   for name, info in manifest["columns"].items()}
+    return columns, manifest
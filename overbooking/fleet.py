@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytic import bump_probability, overbooked_moments
+from .engine import make_rng
+
+# Largest (trials x flights) show-up block drawn at once
+max_block_elements = 4_000_000
+
+
+# A daily schedule of heterogeneous flights, one array entry per flight leg
+@dataclass(frozen=True)
+class Fleet:
+    seats: np.ndarray
+    booked: np.ndarray
+    no_show_rate: np.ndarray
+    ticket_revenue: np.ndarray  # Ticket revenue per flight
+    compensation: np.ndarray  # Compensation per bumped passenger
+
+    @property
+    def num_flights(self):
+        return len(self.seats)
+
+    # Fleet from per-flight ticket counts and fares: tickets (flights, classes),
+    # prices (classes,) or (flights, classes); scalars broadcast to every flight
+    @classmethod
+    def from_arrays(cls, seats, booked, no_show_rate, tickets, prices, compensation):
+        seats = np.asarray(seats, dtype=np.int64)
+        num_flights = len(seats)
+        tickets = np.asarray(tickets, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+        return cls(
+            seats=seats,
+            booked=np.broadcast_to(np.asarray(booked, dtype=np.int64), (num_flights,)).copy(),
+            no_show_rate=np.broadcast_to(np.asarray(no_show_rate, dtype=float), (num_flights,)).copy(),
+            ticket_revenue=np.sum(tickets * prices, axis=-1) * np.ones(num_flights),
+            compensation=np.broadcast_to(np.asarray(compensation, dtype=float), (num_flights,)).copy(),
+        )
+
+    # num_flights identical legs of a FlightProfile booked at booked_per_flight
+    @classmethod
+    def from_profile(cls, profile, booked_per_flight, num_flights=None):
+        num_flights = profile.num_flights if num_flights is None else num_flights
+        ones = np.ones(num_flights)
+        return cls(
+            seats=np.full(num_flights, profile.seats_per_flight, dtype=np.int64),
+            booked=np.full(num_flights, booked_per_flight, dtype=np.int64),
+            no_show_rate=profile.no_show_rate * ones,
+            ticket_revenue=float(profile.ticket_revenue(booked_per_flight)) * ones,
+            compensation=profile.compensation_per_passenger * ones,
+        )
+
+    # Schedule made of several fleets back to back
+    @classmethod
+    def concat(cls, *fleets):
+        return cls(**{field: np.concatenate([getattr(f, field) for f in fleets])
+                      for field in ("seats", "booked", "no_show_rate", "ticket_revenue", "compensation")})
+
+
+# Per-flight and network-level revenue and bump distributions for a heterogeneous schedule.
+# "monte_carlo" draws (trials, flights) show-up blocks; "exact" uses the binomial tail per flight
+# (network totals are sums of independent flights, so their mean and variance add up).
+def simulate_fleet(fleet, num_simulations=1000, rng=None, method="monte_carlo"):
+    if method == "exact":
+        mean_overbooked, var_overbooked = overbooked_moments(fleet.booked, fleet.seats, fleet.no_show_rate)
+        expected_net_revenue = fleet.ticket_revenue - fleet.compensation * mean_overbooked
+        return {
+            "mean_overbooked": mean_overbooked,
+            "bump_probability": bump_probability(fleet.booked, fleet.seats, fleet.no_show_rate),
+            "expected_net_revenue": expected_net_revenue,
+            "network_mean_overbooked": float(mean_overbooked.sum()),
+            "network_std_overbooked": float(np.sqrt(var_overbooked.sum())),
+            "network_mean_net_revenue": float(expected_net_revenue.sum()),
+            "network_std_net_revenue": float(np.sqrt(np.sum(fleet.compensation ** 2 * var_overbooked))),
+        }
+    if method != "monte_carlo":
+        raise ValueError(f"Unknown method: {method}")
+
+    rng = make_rng(rng)
+    num_flights = fleet.num_flights
+    show_prob = 1 - fleet.no_show_rate
+    total_ticket_revenue = fleet.ticket_revenue.sum()
+
+    overbooked_sum = np.zeros(num_flights)
+    bumped_trials = np.zeros(num_flights, dtype=np.int64)
+    network_overbooked = np.zeros(num_simulations, dtype=np.int64)
+    network_compensation = np.zeros(num_simulations)
+
+    trials_per_block = max(1, min(num_simulations, max_block_elements // max(1, num_flights)))
+    for start in range(0, num_simulations, trials_per_block):
+        trials = min(trials_per_block, num_simulations - start)
+        show_up = rng.binomial(fleet.booked, show_prob, size=(trials, num_flights))
+        overbooked = np.maximum(0, show_up - fleet.seats)
+
+        overbooked_sum += overbooked.sum(axis=0)
+        bumped_trials += np.count_nonzero(overbooked, axis=0)
+        network_overbooked[start:start + trials] = overbooked.sum(axis=1)
+        network_compensation[start:start + trials] = overbooked @ fleet.compensation
+
+    mean_overbooked = overbooked_sum / num_simulations
+    net_revenue_per_day = total_ticket_revenue - network_compensation
+    return {
+        "mean_overbooked": mean_overbooked,
+        "bump_probability": bumped_trials / num_simulations,
+        "expected_net_revenue": fleet.ticket_revenue - fleet.compensation * mean_overbooked,
+        "network_overbooked_per_day": network_overbooked,
+        "network_net_revenue_per_day": net_revenue_per_day,
+        "network_mean_overbooked": float(network_overbooked.mean()),
+        "network_std_overbooked": float(network_overbooked.std(ddof=1)) if num_simulations > 1 else 0.0,
+        "network_mean_net_revenue": float(net_revenue_per_day.mean()),
+        "network_std_net_revenue": float(net_revenue_per_day.std(ddof=1)) if num_simulations > 1 else 0.0,
+    }
+
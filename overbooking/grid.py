@@ -0,0 +1,101 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .analytic import expected_overbooked
+from .engine import make_rng, simulate_overbooked_per_day
+from .profiles import domestic_profile, international_profile, ticket_counts
+
+# Class shares of the non-overbooked seats (economy, business, first)
+domestic_class_shares = domestic_profile.class_shares
+international_class_shares = international_profile.class_shares
+
+# Upper bound on the (compensation, no-show, level) revenue block evaluated at once
+max_block_size = 4_000_000
+
+
+# Ticket revenue per flight for each booking level with the notebooks' split: base allocation plus
+# overbooked seats, extra_business_share of them business and the rest economy
+# (profiles.ticket_counts with rule="remainder")
+def ticket_revenue(booking_levels, seats, class_shares, economy_price, business_price, first_price,
+                   extra_business_share=0.10):
+    economy_tickets, business_tickets, first_tickets = ticket_counts(booking_levels, seats, class_shares,
+                                                                     extra_business_share, rule="remainder")
+    return economy_tickets * economy_price + business_tickets * business_price + first_tickets * first_price
+
+
+# Exact expected overbooked passengers per flight for every level at one no-show rate.
+# Cached per (levels, seats, no-show rate) cell, which does not depend on compensation.
+@lru_cache(maxsize=4096)
+def _exact_overbooked_column(booking_levels, seats, no_show_rate):
+    column = expected_overbooked(np.array(booking_levels), seats, no_show_rate)
+    column.flags.writeable = False
+    return column
+
+
+# Expected overbooked passengers per flight, shape (len(booking_levels), len(no_show_rates)).
+# "exact" uses the binomial tail; "monte_carlo" averages num_simulations days of num_flights flights.
+def expected_overbooked_table(booking_levels, seats, no_show_rates, method="exact",
+                              num_flights=1000, num_simulations=1, rng=None):
+    booking_levels = tuple(int(b) for b in booking_levels)
+    no_show_rates = np.asarray(no_show_rates, dtype=float)
+
+    if method == "exact":
+        columns = [_exact_overbooked_column(booking_levels, seats, float(r)) for r in no_show_rates]
+        return np.stack(columns, axis=1) if columns else np.zeros((len(booking_levels), 0))
+
+    if method == "monte_carlo":
+        rng = make_rng(rng)
+        table = np.empty((len(booking_levels), len(no_show_rates)))
+        for j, no_show_rate in enumerate(no_show_rates):
+            per_day = simulate_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng)
+            table[:, j] = per_day.mean(axis=-1) / num_flights
+        return table
+
+    raise ValueError(f"Unknown method: {method}")
+
+
+# Best booking level for every (compensation, no-show rate) cell.
+# Revenue is derived for all compensations with one broadcasted operation per block:
+# net[c, n, l] = ticket_revenue[l] - compensation[c] * overbooked[l, n]
+def solve_grid(compensations, no_show_rates, booking_levels, ticket_revenues, overbooked):
+    compensations = np.asarray(compensations, dtype=float)
+    booking_levels = np.asarray(booking_levels)
+    ticket_revenues = np.asarray(ticket_revenues, dtype=float)
+    overbooked_t = np.asarray(overbooked).T  # (no-show, level)
+
+    best_index = np.empty((len(compensations), len(no_show_rates)), dtype=np.int64)
+    best_revenue = np.empty((len(compensations), len(no_show_rates)))
+    cell_size = max(1, overbooked_t.size)
+    step = max(1, max_block_size // cell_size)
+
+    for start in range(0, len(compensations), step):
+        block = compensations[start:start + step, None, None]
+        net_revenue = ticket_revenues - block * overbooked_t
+        best_index[start:start + step] = np.argmax(net_revenue, axis=-1)
+        best_revenue[start:start + step] = np.max(net_revenue, axis=-1)
+
+    return booking_levels[best_index], best_revenue
+
+
+# Sensitivity analysis over compensation x no-show rate, same layout as the notebooks' results_df.
+# overbooked: a precomputed expected_overbooked_table for these levels and no-show rates, reused
+# instead of recomputed (so a surface.build_surface over the same grid gives the same answers)
+def sensitivity_grid(compensations, no_show_rates, booking_levels, seats, class_shares,
+                     economy_price, business_price, first_price, method="exact",
+                     num_flights=1000, num_simulations=1, rng=None, overbooked=None):
+    revenues = ticket_revenue(booking_levels, seats, class_shares, economy_price, business_price, first_price)
+    if overbooked is None:
+        overbooked = expected_overbooked_table(booking_levels, seats, no_show_rates, method, num_flights,
+                                               num_simulations, rng)
+    best_levels, best_revenues = solve_grid(compensations, no_show_rates, booking_levels, revenues, overbooked)
+
+    compensation_col, no_show_col = np.meshgrid(compensations, no_show_rates, indexing='ij')
+    return pd.DataFrame({
+        'No-show Rate': no_show_col.ravel(),
+        'Compensation ($)': compensation_col.ravel(),
+        'Optimal Booking Level': best_levels.ravel(),
+        'Optimal Overbooking Amount': best_levels.ravel() - seats,
+        'Max Expected Net Revenue ($)': best_revenues.ravel(),
+    })
@@ -0,0 +1,248 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytic import binomial_pmf, overbooked_moments
+from .parallel import run_tasks, spawn_task_seeds
+
+# (trials x flights) states advanced together; small enough to stay in cache across the day loop
+block_elements = 65_536
+
+# Poisson arrival tables stop once the remaining tail is below this
+arrival_tail = 1e-12
+
+# Arrival tables up to this many levels are applied one comparison per level, longer ones by bisection
+max_loop_levels = 16
+
+
+# Booking curve before departure. Requests per flight arrive as Poisson counts each day, growing
+# like (day + 1) ** arrival_shape towards departure; every booking on hand cancels independently
+# with the same daily probability. Day 0 is horizon_days before departure.
+@dataclass(frozen=True)
+class BookingHorizon:
+    horizon_days: int = 180
+    expected_demand: float = 240.0  # Expected booking requests per flight over the horizon
+    cancellation_probability: float = 0.10  # Chance a booking made on day 0 cancels before departure
+    arrival_shape: float = 1.0
+
+    # Demand as a multiple of a profile's seats
+    @classmethod
+    def from_profile(cls, profile, demand_factor=1.2, **changes):
+        return cls(expected_demand=demand_factor * profile.seats_per_flight, **changes)
+
+    # Expected booking requests per flight on each day
+    def arrival_rates(self):
+        weights = (np.arange(self.horizon_days) + 1.0) ** self.arrival_shape
+        return self.expected_demand * weights / weights.sum()
+
+    # Daily cancellation probability of a booking on hand
+    def cancellation_rate(self):
+        return 1 - (1 - self.cancellation_probability) ** (1 / self.horizon_days)
+
+
+# Authorization limits as an int array of shape (horizon_days,) or (num_flights, horizon_days);
+# a scalar is the same limit every day
+def authorization_limits(limits, horizon_days):
+    limits = np.asarray(limits, dtype=np.int64)
+    if limits.ndim == 0:
+        return np.full(horizon_days, int(limits))
+    if limits.shape[-1] != horizon_days:
+        raise ValueError(f"Expected {horizon_days} daily limits, got {limits.shape[-1]}")
+    return limits
+
+
+# Poisson PMF P(A = k) for k = 0..size-1, computed in log space (exp(-rate) underflows past ~745)
+def _poisson_pmf(rate, size):
+    if rate == 0:
+        return (np.arange(size) == 0).astype(float)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, size)))))
+    return np.exp(np.arange(size) * np.log(rate) - rate - log_factorial)
+
+
+# Poisson CDF P(A <= k) for k = 0, 1, ... while the tail is above arrival_tail. The table is
+# sized rate + 12 sd + 30 up front, far past that tail, so its length is bounded; it is normalized
+# by its total so rounding in the log-space PMF cannot keep the tail above arrival_tail.
+def _poisson_cdf(rate):
+    cdf = np.cumsum(_poisson_pmf(rate, int(np.ceil(rate + 12 * np.sqrt(rate))) + 30))
+    cdf /= cdf[-1]
+    tail_end = np.flatnonzero(1 - cdf <= arrival_tail)
+    return cdf[:tail_end[0]] if tail_end.size else cdf
+
+
+# Worker: simulate one block of trials through the horizon; returns per-trial totals over flights
+def _simulate_block(task):
+    profile, horizon, limits, num_trials, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    num_flights = profile.num_flights
+    rates = horizon.arrival_rates()
+    cancel = horizon.cancellation_rate()
+    max_limit = int(limits.max())
+    # P(no cancellation | n on hand) and the binomial ratio used to step the cancellation CDF
+    no_cancel = (1 - cancel) ** np.arange(max_limit + 1)
+    odds = cancel / (1 - cancel) if cancel < 1 else np.inf
+
+    on_hand = np.zeros((num_trials, num_flights), dtype=np.int32)
+    u = np.empty((2, num_trials, num_flights))
+    arrivals = np.empty((num_trials, num_flights), dtype=np.int32)
+    requests = np.zeros(num_trials)
+    cancellations = np.zeros(num_trials)
+    bookings_curve = np.zeros(horizon.horizon_days)
+
+    for day in range(horizon.horizon_days):
+        rng.random(out=u)
+
+        # Cancellations by inverse CDF: most states have none, the rest step up the binomial CDF
+        cancelled = np.zeros_like(on_hand)
+        active = np.flatnonzero(u[1].ravel() >= no_cancel[on_hand].ravel())
+        if active.size and cancel > 0:
+            n = on_hand.ravel()[active]
+            target = u[1].ravel()[active]
+            pmf = no_cancel[n]
+            cdf = pmf.copy()
+            k = np.zeros_like(n)
+            while active.size:
+                k += 1
+                pmf = pmf * (n - k + 1) / k * odds
+                cdf = cdf + pmf
+                done = (target < cdf) | (k >= n)
+                cancelled.ravel()[active[done]] = k[done]
+                keep = ~done
+                active, n, target, pmf, cdf, k = active[keep], n[keep], target[keep], pmf[keep], cdf[keep], k[keep]
+        on_hand -= cancelled
+        cancellations += cancelled.sum(axis=-1)
+
+        # Requests by inverse CDF, accepted up to the day's authorization limit
+        levels = _poisson_cdf(rates[day])
+        if len(levels) <= max_loop_levels:
+            arrivals.fill(0)
+            for level in levels:
+                arrivals += u[0] > level
+        else:
+            arrivals[...] = np.searchsorted(levels, u[0], side='left')
+        requests += arrivals.sum(axis=-1, dtype=np.int64)
+        room = np.maximum(0, limits[..., day] - on_hand)
+        on_hand += np.minimum(arrivals, room, dtype=np.int32)
+        bookings_curve[day] = on_hand.sum()
+
+    shows = rng.binomial(on_hand, 1 - profile.no_show_rate)
+    overbooked = np.maximum(0, shows - profile.seats_per_flight)
+    net_revenue = profile.ticket_revenue(on_hand) - profile.compensation_per_passenger * overbooked
+    return {
+        "net_revenue": net_revenue.sum(axis=-1),
+        "overbooked": overbooked.sum(axis=-1),
+        "final_bookings": on_hand.sum(axis=-1),
+        "requests": requests,
+        "cancellations": cancellations,
+        "bookings_curve": bookings_curve,
+    }
+
+
+# Transition matrix of daily cancellations: n on hand -> n - k with probability Binomial(n, rate)(k)
+def _cancellation_matrix(size, rate):
+    n = np.arange(size)
+    pmf = binomial_pmf(n, rate)
+    k = n[:, None] - n[None, :]
+    return np.where(k >= 0, np.take_along_axis(pmf, k.clip(0), axis=1), 0.0)
+
+
+# Arrivals for one day: n -> min(n + a, limit) while below the limit, no change at or above it.
+# Returns the new distribution and the expected accepted bookings.
+def _accept_arrivals(dist, arrival_pmf, limit):
+    n = np.arange(len(dist))
+    after = np.where(n >= limit, dist, 0.0)
+    below = dist[:limit]
+    if below.size:
+        spread = np.convolve(below, arrival_pmf[:limit + 1])[:limit + 1]
+        spread[limit] = below.sum() - spread[:limit].sum()
+        after[:limit + 1] += spread
+    return after, after @ n - dist @ n
+
+
+# Exact expectations for one limit schedule by pushing the bookings-on-hand distribution through the horizon
+def _exact_schedule(profile, horizon, limits):
+    size = int(limits.max()) + 1
+    states = np.arange(size)
+    cancellation = _cancellation_matrix(size, horizon.cancellation_rate())
+    rates = horizon.arrival_rates()
+
+    dist = np.zeros(size)
+    dist[0] = 1.0
+    cancellations = 0.0
+    accepted = 0.0
+    bookings_curve = np.zeros(horizon.horizon_days)
+    for day in range(horizon.horizon_days):
+        cancellations += horizon.cancellation_rate() * (dist @ states)
+        arrival_pmf = _poisson_pmf(rates[day], size)
+        dist, accepted_today = _accept_arrivals(dist @ cancellation, arrival_pmf, int(limits[day]))
+        accepted += accepted_today
+        bookings_curve[day] = dist @ states
+
+    mean, var = overbooked_moments(states, profile.seats_per_flight, profile.no_show_rate)
+    ticket_revenue = profile.ticket_revenue(states)
+    compensation = profile.compensation_per_passenger
+    net = ticket_revenue - compensation * mean
+    net_second = ticket_revenue ** 2 - 2 * compensation * ticket_revenue * mean + compensation ** 2 * (var + mean ** 2)
+    return {
+        "net_revenue": dist @ net,
+        "net_revenue_second_moment": dist @ net_second,
+        "overbooked": dist @ mean,
+        "final_bookings": dist @ states,
+        "requests": rates.sum(),
+        "cancellations": cancellations,
+        "denied_requests": rates.sum() - accepted,
+        "bookings_curve": bookings_curve,
+    }
+
+
+# Net revenue per flight when bookings build up over a horizon under daily authorization limits.
+# Extends run_simulation: tickets are paid for the bookings on hand at departure (cancellations
+# are refunded) and bumps cost compensation_per_passenger. limits is a scalar, (horizon_days,) or
+# (num_flights, horizon_days). "monte_carlo" simulates every (trial, flight) path with one day loop
+# over vectorized blocks, fanned out across num_workers processes; "exact" propagates the
+# bookings-on-hand distribution of each distinct schedule instead of sampling.
+def simulate_booking_horizon(profile, horizon, limits, num_simulations=1000, seed=None, method="monte_carlo",
+                             num_workers=1):
+    limits = authorization_limits(limits, horizon.horizon_days)
+    if limits.ndim == 2 and limits.shape[0] != profile.num_flights:
+        raise ValueError(f"Expected limits for {profile.num_flights} flights, got {limits.shape[0]}")
+    num_flights = profile.num_flights
+
+    if method == "exact":
+        schedules, counts = np.unique(limits.reshape(-1, horizon.horizon_days), axis=0, return_counts=True)
+        weights = counts / counts.sum()
+        parts = [_exact_schedule(profile, horizon, schedule) for schedule in schedules]
+        combined = {key: sum(w * part[key] for w, part in zip(weights, parts)) for key in parts[0]}
+        # Flights are independent, so the daily per-flight average has variance sum(var_i) / F^2
+        flight_var = sum(w * (part["net_revenue_second_moment"] - part["net_revenue"] ** 2) for w, part in zip(weights, parts))
+        return {
+            "avg_net_revenue": float(combined["net_revenue"]),
+            "std_net_revenue": float(np.sqrt(flight_var / num_flights)),
+            "avg_overbooked_passengers": float(combined["overbooked"]),
+            "avg_final_bookings": float(combined["final_bookings"]),
+            "avg_requests": float(combined["requests"]),
+            "avg_denied_requests": float(combined["denied_requests"]),
+            "avg_cancellations": float(combined["cancellations"]),
+            "bookings_curve": combined["bookings_curve"],
+        }
+    if method != "monte_carlo":
+        raise ValueError(f"Unknown method: {method}")
+
+    block_size = max(1, block_elements // num_flights)
+    sizes = [min(block_size, num_simulations - start) for start in range(0, num_simulations, block_size)]
+    seeds = spawn_task_seeds(seed, 1, len(sizes))[0]
+    blocks = run_tasks(_simulate_block, [(profile, horizon, limits, size, s) for size, s in zip(sizes, seeds)], num_workers)
+
+    per_trial = {key: np.concatenate([block[key] for block in blocks]) / num_flights
+                 for key in ("net_revenue", "overbooked", "final_bookings", "requests", "cancellations")}
+    accepted = per_trial["final_bookings"] + per_trial["cancellations"]
+    return {
+        "avg_net_revenue": float(np.mean(per_trial["net_revenue"])),
+        "std_net_revenue": float(np.std(per_trial["net_revenue"], ddof=1)) if num_simulations > 1 else 0.0,
+        "avg_overbooked_passengers": float(np.mean(per_trial["overbooked"])),
+        "avg_final_bookings": float(np.mean(per_trial["final_bookings"])),
+        "avg_requests": float(np.mean(per_trial["requests"])),
+        "avg_denied_requests": float(np.mean(per_trial["requests"] - accepted)),
+        "avg_cancellations": float(np.mean(per_trial["cancellations"])),
+        "bookings_curve": sum(block["bookings_curve"] for block in blocks) / (num_simulations * num_flights),
+        "net_revenue_per_trial": per_trial["net_revenue"],
+    }
@@ -0,0 +1,106 @@
+import numpy as np
+
+from .analytic import flight_overbooked_pmf
+from .engine import make_rng
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Whether the compiled (Numba) kernels can be used; otherwise the NumPy fallback runs
+numba_available = numba is not None
+
+backends = ("numba", "numpy")
+
+# Largest (trials x flights) block hashed at once by the NumPy fallback
+max_block_elements = 4_000_000
+
+# splitmix64 constants
+_golden = np.uint64(0x9E3779B97F4A7C15)
+_mix1 = np.uint64(0xBF58476D1CE4E5B9)
+_mix2 = np.uint64(0x94D049BB133111EB)
+_shift30, _shift27, _shift31, _shift11 = np.uint64(30), np.uint64(27), np.uint64(31), np.uint64(11)
+_unit = 2.0 ** -53
+
+
+# Counter-based uniforms: splitmix64 of key + (counter + 1) * golden, top 53 bits in [0, 1).
+# Every (trial, flight) has its own counter, so draws do not depend on the order they are
+# computed in (or on how trials are split across threads), and both backends give the same bits.
+def _uniforms(key, counters):
+    with np.errstate(over="ignore"):
+        z = key + (counters + np.uint64(1)) * _golden
+        z = (z ^ (z >> _shift30)) * _mix1
+        z = (z ^ (z >> _shift27)) * _mix2
+    z ^= z >> _shift31
+    return (z >> _shift11).astype(np.float64) * _unit
+
+
+# NumPy fallback: per-flight bumps by inverse CDF of the single-flight overbooked PMF, blocked over trials
+def _overbooked_numpy(cdf, key, num_flights, num_simulations):
+    result = np.empty(num_simulations, dtype=np.int64)
+    last = len(cdf) - 1
+    block_size = max(1, max_block_elements // max(1, num_flights))
+    for start in range(0, num_simulations, block_size):
+        size = min(block_size, num_simulations - start)
+        counters = np.arange(start * num_flights, (start + size) * num_flights, dtype=np.uint64)
+        bumps = np.minimum(np.searchsorted(cdf, _uniforms(key, counters), side='right'), last)
+        result[start:start + size] = bumps.reshape(size, num_flights).sum(axis=1)
+    return result
+
+
+# Compiled kernel: one pass per trial (prange across threads) hashing, inverting and summing
+# in registers, with no intermediate arrays. Compiled on first call and cached on disk.
+if numba_available:
+    @numba.njit(parallel=True, cache=True)
+    def _overbooked_numba(cdf, key, num_flights, num_simulations):
+        result = np.empty(num_simulations, dtype=np.int64)
+        last = len(cdf) - 1
+        flights = np.uint64(num_flights)
+        for trial in numba.prange(num_simulations):
+            counter = np.uint64(trial) * flights
+            total = 0
+            for _ in range(num_flights):
+                counter += np.uint64(1)
+                z = key + counter * _golden
+                z = (z ^ (z >> _shift30)) * _mix1
+                z = (z ^ (z >> _shift27)) * _mix2
+                z ^= z >> _shift31
+                u = np.float64(z >> _shift11) * _unit
+                j = 0
+                while j < last and cdf[j] <= u:
+                    j += 1
+                total += j
+            result[trial] = total
+        return result
+
+
+def _backend(backend):
+    if backend == "numba" and not numba_available:
+        raise ImportError("The numba backend requires numba (pip install numba); use backend='numpy'")
+    if backend is None:
+        return "numba" if numba_available else "numpy"
+    if backend not in backends:
+        raise ValueError(f"Unknown backend: {backend}")
+    return backend
+
+
+# Total overbooked passengers per simulated day, like engine.simulate_overbooked_per_day (a scalar
+# level returns (num_simulations,), a list (len(levels), num_simulations)), but each flight's bumps
+# are drawn directly by inverse CDF of its overbooked PMF from a counter-based stream, so no
+# show-up matrix is built. backend="numba" runs the compiled kernel, "numpy" the fallback and None
+# picks numba when it is installed; both give identical results for the same rng. The stream is
+# not numpy's, so draws differ from method="monte_carlo" for the same seed (the distribution is the same).
+def kernel_overbooked_per_day(booked_per_flight, seats, no_show_rate, num_flights, num_simulations, rng=None,
+                              backend=None):
+    backend = _backend(backend)
+    levels = np.atleast_1d(np.asarray(booked_per_flight))
+    keys = make_rng(rng).integers(0, np.iinfo(np.uint64).max, size=len(levels), dtype=np.uint64, endpoint=True)
+    result = np.empty((len(levels), num_simulations), dtype=np.int64)
+    for i, (level, key) in enumerate(zip(levels.tolist(), keys)):
+        cdf = np.cumsum(flight_overbooked_pmf(int(level), seats, no_show_rate))
+        if backend == "numba":
+            result[i] = _overbooked_numba(cdf, key, int(num_flights), int(num_simulations))
+        else:
+            result[i] = _overbooked_numpy(cdf, key, num_flights, num_simulations)
+    return result[0] if np.ndim(booked_per_flight) == 0 else result
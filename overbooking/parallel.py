@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .engine import simulate_overbooked_per_day
+
+# Simulated days per task when a booking level is split into chunks
+default_chunk_size = 250
+
+
+# Process start method for the pool. fork keeps the scripts (which run at import
+# time) from being re-executed in every worker.
+def _mp_context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+# Independent random streams for every (booking level, chunk) task. The streams only
+# depend on the root seed and the task layout, never on the number of workers.
+def spawn_task_seeds(seed, num_levels, num_chunks):
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [level_seq.spawn(num_chunks) for level_seq in root.spawn(num_levels)]
+
+
+# Worker: overbooked passengers per day for one chunk of simulated days
+def _simulate_chunk(task):
+    booked_per_flight, seats, no_show_rate, num_flights, num_simulations, seed_seq = task
+    rng = np.random.default_rng(seed_seq)
+    return simulate_overbooked_per_day(booked_per_flight, seats, no_show_rate, num_flights, num_simulations, rng)
+
+
+# Map tasks over a process pool (or in-process when max_workers == 1), keeping task order
+def run_tasks(func, tasks, max_workers=None):
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks)) if tasks else 1
+    if max_workers <= 1:
+        return [func(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context()) as executor:
+        return list(executor.map(func, tasks, chunksize=chunksize))
+
+
+# Overbooked passengers per day for every booking level, fanned out across processes.
+# Returns {booked_per_flight: array of shape (num_simulations,)}; results are identical
+# for any max_workers given the same seed and chunk_size.
+def simulate_levels_parallel(booking_levels, seats, no_show_rate, num_flights, num_simulations,
+                             seed=None, max_workers=None, chunk_size=default_chunk_size):
+    booking_levels = list(booking_levels)
+    tasks, num_chunks = _level_tasks(booking_levels, seats, no_show_rate, num_flights, num_simulations, seed, chunk_size)
+    chunks = run_tasks(_simulate_chunk, [task for level_tasks in tasks for task in level_tasks], max_workers)
+
+    results = {}
+    for level_index, booked_per_flight in enumerate(booking_levels):
+        start = level_index * num_chunks
+        level_chunks = chunks[start:start + num_chunks]
+        results[booked_per_flight] = np.concatenate(level_chunks) if level_chunks else np.zeros(0, dtype=np.int64)
+    return results
+
+
+# Same draws as simulate_levels_parallel, yielded one level at a time as (booked_per_flight, per_day)
+# so only one level's days are held in memory (chunks of a level still run across processes)
+def iter_levels_parallel(booking_levels, seats, no_show_rate, num_flights, num_simulations,
+                         seed=None, max_workers=None, chunk_size=default_chunk_size):
+    booking_levels = list(booking_levels)
+    tasks, _ = _level_tasks(booking_levels, seats, no_show_rate, num_flights, num_simulations, seed, chunk_size)
+    for booked_per_flight, level_tasks in zip(booking_levels, tasks):
+        level_chunks = run_tasks(_simulate_chunk, level_tasks, max_workers)
+        yield booked_per_flight, np.concatenate(level_chunks) if level_chunks else np.zeros(0, dtype=np.int64)
+
+
+# Chunk tasks per booking level with their random streams, and the number of chunks per level
+def _level_tasks(booking_levels, seats, no_show_rate, num_flights, num_simulations, seed, chunk_size):
+    chunk_sizes = [min(chunk_size, num_simulations - start) for start in range(0, num_simulations, chunk_size)]
+    seeds = spawn_task_seeds(seed, len(booking_levels), len(chunk_sizes))
+    tasks = [[(booked_per_flight, seats, no_show_rate, num_flights, size, seeds[level_index][chunk_index])
+              for chunk_index, size in enumerate(chunk_sizes)]
+             for level_index, booked_per_flight in enumerate(booking_levels)]
+    return tasks, len(chunk_sizes)
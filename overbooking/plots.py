@@ -0,0 +1,131 @@
+import numpy as np
+
+from .compensation import logistic_loyalty_loss
+
+# At most this many cell labels on a sensitivity contour (every k-th cell is labelled)
+max_contour_labels = 400
+
+_pyplot = None
+
+
+# matplotlib.pyplot with the seaborn theme, imported on first use so compute-only runs never load
+# the plotting stack (pick a backend with matplotlib.use before the first figure for headless runs)
+def pyplot():
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        sns.set_theme(style="whitegrid")
+        _pyplot = plt
+    return _pyplot
+
+
+# Bar chart of average net revenue per overbooking strategy
+def plot_strategy_comparison(revenues_by_strategy, profile):
+    import seaborn as sns
+    fig, ax = pyplot().subplots(figsize=(10, 7))
+    strategies = list(revenues_by_strategy.keys())
+    revenues = list(revenues_by_strategy.values())
+    sns.barplot(x=strategies, y=revenues, palette='crest', hue=revenues, legend=False, ax=ax)
+
+    for i, revenue in enumerate(revenues):
+        ax.text(i, revenue + (0.02 * revenue), f"${revenue:,.0f}", ha='center', fontsize=10, fontweight='bold')
+
+    ax.set_xlabel("Overbooking Strategy", fontsize=12)
+    ax.set_ylabel("Average Net Revenue ($)", fontsize=12)
+    ax.set_title(f"{profile.name} Flight: Overbooking Strategy Comparison", fontsize=14)
+    ax.tick_params(axis='x', labelrotation=15)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    fig.tight_layout()
+    return fig
+
+
+# Net revenue curve over booking levels with the best level and strategy points marked
+def plot_booking_levels(sweep, profile, strategy_points, annotation_offset=400):
+    fig, ax = pyplot().subplots(figsize=(10, 7))
+    booking_levels = sweep["booking_levels"]
+    net_revenues = sweep["avg_net_revenue"]
+    best_booking_level = sweep["best_booking_level"]
+    best_revenue = sweep["best_revenue"]
+    seats = profile.seats_per_flight
+    ax.plot(booking_levels, net_revenues, color='b', marker='o', linestyle='-', label="Net Revenue")
+
+    ax.axvline(best_booking_level, color='r', linestyle='--', label=f"Best: {best_booking_level} seats")
+    best_booking_percentage = ((best_booking_level - seats) / seats) * 100
+
+    ax.annotate(f"${best_revenue:,.2f}",
+                xy=(best_booking_level, best_revenue), color='red',
+                xytext=(best_booking_level + 1, best_revenue + annotation_offset))
+
+    # Different points on graph
+    colors = ['orange', 'green', 'purple', 'black']
+    revenue_by_level = dict(zip(np.asarray(booking_levels).tolist(), net_revenues))
+    for i, (label, x_val) in enumerate(strategy_points.items()):
+        ax.scatter(x_val, revenue_by_level[x_val], color=colors[i % len(colors)], s=85, label=label, zorder=5)
+
+    ax.grid(True, which='both', axis='both', linestyle='--', alpha=0.7)
+    ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+    ax.set_xlabel(f"Passengers per Flight out of {seats} \n({best_booking_percentage}% Overbooked - ${profile.compensation_per_passenger} Compensation Per Overbooked Passenger)")
+    ax.set_ylabel("Average Net Revenue ($)")
+    ax.set_title("Optimizing Overbooking for Maximum Revenue")
+    fig.tight_layout()
+    return fig
+
+
+# Average overbooking rate over booking levels with the best level marked
+def plot_overbooking_rates(sweep, profile):
+    fig, ax = pyplot().subplots(figsize=(10, 5))
+    results = sweep["results"]
+    booking_levels = list(results.keys())
+    best = sweep["best_booking_level"]
+    overbooking_rates = [results[b]["avg_overbooking_rate"] for b in booking_levels]
+    ax.plot(booking_levels, overbooking_rates, marker='o', linestyle='-')
+    ax.set_xlabel(f"Passangers Per Flight out of {profile.seats_per_flight}")
+    ax.set_ylabel("Average Overbooking Rate (%)")
+    ax.set_title("Optimizing Overbooking Levels (0.1% Getting Overbooked)")
+    if best is not None:
+        ax.axvline(best, color='r', linestyle='--', label=f'Best: {best} passangers \n {sweep["best_avg_overbooking_rate"]:.4f}% getting overbooked ')
+        ax.legend()
+    ax.grid()
+    return fig
+
+
+# Logistic loyalty loss curves for every compensation case
+def plot_loyalty_loss_curves(cases, max_delay=24):
+    fig, ax = pyplot().subplots(figsize=(10, 6))
+    h_vals = np.linspace(0, max_delay, 200)
+
+    for label, params in cases.items():
+        ax.plot(h_vals, logistic_loyalty_loss(h_vals, params['L'], params['k'], params['h0']), label=label)
+
+    ax.set_title('Logistic Loyalty Loss Curves by Scenario')
+    ax.set_xlabel('Delay (hours)')
+    ax.set_ylabel('Loss Rate')
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+# Max revenue contour over (no-show rate, compensation) with the optimal overbooking amount
+# written on the cells. revenue and overbooking are (compensation, no-show rate) tables. Labels go
+# on every label_step-th row and column (default: as many as fit in max_contour_labels).
+def plot_sensitivity_contour(revenue, overbooking, no_show_rates, compensations, title, label_step=None):
+    fig, ax = pyplot().subplots(figsize=(12, 7))
+    X, Y = np.meshgrid(no_show_rates, compensations)
+    contour = ax.contourf(X, Y, revenue, cmap='viridis', levels=25)
+    cbar = fig.colorbar(contour, ax=ax)
+    cbar.set_label('Max Expected Net Revenue per Flight ($)', fontsize=12)
+
+    if label_step is None:
+        label_step = max(1, int(np.ceil(np.sqrt(np.size(overbooking) / max_contour_labels))))
+    for x, y, value in zip(X[::label_step, ::label_step].ravel(), Y[::label_step, ::label_step].ravel(),
+                           np.asarray(overbooking)[::label_step, ::label_step].ravel()):
+        ax.text(x, y, str(int(value)), ha='center', va='center', fontsize=9, color='white', weight='bold')
+
+    ax.set_title(title, fontsize=14)
+    ax.set_xlabel('No-show Rate', fontsize=12)
+    ax.set_ylabel('Compensation per Bumped Passenger ($)', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.4)
+    fig.tight_layout()
+    return fig
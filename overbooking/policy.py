@@ -0,0 +1,86 @@
+import numpy as np
+
+from .analytic import binomial_pmf, expected_overbooked
+from .solver import default_max_extra
+
+# Each day is split into micro-periods with at most this chance of a booking request,
+# so at most one request per period is a good approximation (error O(p^2) per period)
+max_step_probability = 0.05
+
+
+# Expected booking requests per day and fare class, shape (horizon_days, classes). Class c's
+# requests follow the horizon's booking curve with its own arrival shape (e.g. business books late).
+def class_arrival_rates(horizon, class_demand, arrival_shapes=None):
+    class_demand = np.asarray(class_demand, dtype=float)
+    if arrival_shapes is None:
+        arrival_shapes = np.full(len(class_demand), horizon.arrival_shape)
+    weights = (np.arange(horizon.horizon_days) + 1.0)[:, None] ** np.asarray(arrival_shapes, dtype=float)
+    return class_demand * weights / weights.sum(axis=0)
+
+
+# Optimal authorization levels per day and fare class by backward induction over
+# (day, bookings on hand). Each day bookings on hand cancel with probability cancellation_rate,
+# then class-c requests arrive at class_rates[day, c]; a request is accepted when its fare beats
+# the drop in value-to-go from one more booking. The terminal value is minus the expected bump
+# cost, compensation * E[(Binomial(n, 1 - no_show_rate) - seats)^+], for every n at once.
+# Cancellations are independent of the rest of the flight, so a booking accepted on day d keeps
+# fare * (1 - refund_fraction * P(cancelled before departure)) in expectation and the state stays
+# one-dimensional. Returns value tables (float32) and authorization levels (int16).
+def solve_dynamic_policy(seats, no_show_rate, compensation, fares, class_rates, cancellation_rate,
+                         refund_fraction=1.0, max_bookings=None):
+    fares = np.asarray(fares, dtype=float)
+    class_rates = np.asarray(class_rates, dtype=float)
+    horizon_days = class_rates.shape[0]
+    if max_bookings is None:
+        max_bookings = seats + default_max_extra(seats, no_show_rate)
+    states = np.arange(max_bookings + 1)
+
+    # Daily cancellations: n on hand -> n - k with probability Binomial(n, rate)(k)
+    cancel_pmf = binomial_pmf(states, cancellation_rate)
+    drop = states[:, None] - states[None, :]
+    cancellation = np.where(drop >= 0, np.take_along_axis(cancel_pmf, drop.clip(0), axis=1), 0.0)
+
+    # Share of a fare kept by a booking accepted on each day (cancellation rounds left before departure)
+    rounds_left = horizon_days - 1 - np.arange(horizon_days)
+    kept = 1 - refund_fraction * (1 - (1 - cancellation_rate) ** rounds_left)
+
+    steps_per_day = np.maximum(1, np.ceil(class_rates.sum(axis=1) / max_step_probability)).astype(np.int64)
+    value = np.empty((horizon_days + 1, len(states)), dtype=np.float32)
+    levels = np.empty((horizon_days, len(fares)), dtype=np.int16)
+
+    v = -compensation * expected_overbooked(states, seats, no_show_rate)
+    value[horizon_days] = v
+    for day in range(horizon_days - 1, -1, -1):
+        reward = (fares * kept[day])[:, None]
+        probability = (class_rates[day] / steps_per_day[day])[:, None]
+        for _ in range(steps_per_day[day]):
+            opportunity_cost = v[:-1] - v[1:]
+            gain = np.maximum(0.0, reward - opportunity_cost)
+            v[:-1] += np.sum(probability * gain, axis=0)
+
+        # Accept class c while bookings on hand are below its level
+        accept = reward > (v[:-1] - v[1:])
+        levels[day] = np.where(accept.all(axis=1), max_bookings, np.argmin(accept, axis=1))
+
+        v = cancellation @ v
+        value[day] = v
+
+    return {
+        "authorization_levels": levels,
+        "expected_revenue": float(v[0]),  # Expected net revenue per flight, starting with no bookings
+        "value": value,
+        "steps_per_day": steps_per_day,
+        "max_bookings": max_bookings,
+    }
+
+
+# Dynamic policy for a profile's fares and compensation. Demand per class defaults to the
+# horizon's expected demand split by the profile's class shares.
+def solve_profile_policy(profile, horizon, class_demand=None, arrival_shapes=None, refund_fraction=1.0,
+                         max_bookings=None):
+    if class_demand is None:
+        class_demand = horizon.expected_demand * np.asarray(profile.class_shares, dtype=float)
+    fares = (profile.economy_price, profile.business_price, profile.first_price)
+    class_rates = class_arrival_rates(horizon, class_demand, arrival_shapes)
+    return solve_dynamic_policy(profile.seats_per_flight, profile.no_show_rate, profile.compensation_per_passenger,
+                                fares, class_rates, horizon.cancellation_rate(), refund_fraction, max_bookings)
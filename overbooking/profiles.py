@@ -0,0 +1,101 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+# How extra seats (booked - seats) are split into classes, see ticket_counts
+ticket_rules = ("truncate", "remainder")
+
+
+# Tickets sold per class (economy, business, first): the base allocation int(class_share * seats)
+# plus the extra seats booked - seats, none of them first class.
+# rule="truncate" (FlightProfile, the Max_Revenue scripts) sells trunc(extra_*_share * extra) of
+# each class, so a level below capacity removes tickets; rule="remainder" (the sensitivity
+# notebooks, grid.ticket_revenue) sells trunc(extra_business_share * extra) business and the rest
+# economy, and never goes below the base allocation.
+# Arguments broadcast; class_shares has the classes on its last axis (one row per scenario).
+def ticket_counts(booked, seats, class_shares, extra_business_share=0.10, extra_economy_share=0.90, rule="truncate"):
+    booked = np.asarray(booked)
+    class_shares = np.asarray(class_shares, dtype=float)
+    base_economy, base_business, base_first = (np.trunc(class_shares[..., k] * seats).astype(int) for k in range(3))
+
+    if rule == "truncate":
+        extra_seats = booked - seats
+        extra_business = np.trunc(extra_business_share * extra_seats).astype(int)
+        extra_economy = np.trunc(extra_economy_share * extra_seats).astype(int)
+    elif rule == "remainder":
+        extra_seats = np.maximum(0, booked - seats)
+        extra_business = np.trunc(extra_business_share * extra_seats).astype(int)
+        extra_economy = extra_seats - extra_business
+    else:
+        raise ValueError(f"Unknown ticket rule: {rule}")
+    extra_first = np.zeros_like(extra_business)  # No extra first-class seats
+
+    return base_economy + extra_economy, base_business + extra_business, base_first + extra_first
+
+
+# Route/aircraft economics shared by every simulation of a flight type
+@dataclass(frozen=True)
+class FlightProfile:
+    name: str
+    num_flights: int  # Total flights per day
+    seats_per_flight: int  # Seats per flight
+    no_show_rate: float
+    compensation_per_passenger: float  # Compensation for bumped passengers
+    economy_price: float  # two-way ticket price / 2
+    business_multiplier: float = 4
+    first_multiplier: float = 6
+    class_shares: tuple = (0.85, 0.10, 0.05)  # Economy, business, first share of the seats
+    extra_business_share: float = 0.10  # Share of overbooked seats sold as business
+    extra_economy_share: float = 0.90  # Share of overbooked seats sold as economy
+    route: str = None  # Route type of the delay and loyalty-loss models (a key of compensation.tri_params)
+
+    @property
+    def business_price(self):
+        return self.business_multiplier * self.economy_price
+
+    @property
+    def first_price(self):
+        return self.first_multiplier * self.economy_price
+
+    # Same profile with some parameters changed, e.g. profile.with_params(no_show_rate=0.1)
+    def with_params(self, **changes):
+        return replace(self, **changes)
+
+    # Tickets sold per class for one or several booking levels. Extra (or missing) seats
+    # are split by extra_*_share and truncated, as in the Max_Revenue scripts.
+    def ticket_counts(self, booked_per_flight):
+        return ticket_counts(booked_per_flight, self.seats_per_flight, self.class_shares, self.extra_business_share,
+                             self.extra_economy_share)
+
+    # Ticket revenue per flight for one or several booking levels
+    def ticket_revenue(self, booked_per_flight):
+        economy_tickets, business_tickets, first_tickets = self.ticket_counts(booked_per_flight)
+        return economy_tickets * self.economy_price + business_tickets * self.business_price + first_tickets * self.first_price
+
+
+domestic_profile = FlightProfile(
+    name="Domestic",
+    num_flights=1000,
+    seats_per_flight=200,
+    no_show_rate=0.04,
+    compensation_per_passenger=1793.52,
+    economy_price=200,
+    class_shares=(0.85, 0.10, 0.05),
+    route="domestic",
+)
+
+international_profile = FlightProfile(
+    name="International",
+    num_flights=100,
+    seats_per_flight=400,
+    no_show_rate=0.075,
+    compensation_per_passenger=5936.91,
+    economy_price=600,
+    class_shares=(0.90, 0.075, 0.025),
+    route="international",
+)
+
+profiles = {
+    "domestic": domestic_profile,
+    "international": international_profile,
+}
@@ -0,0 +1,97 @@
+import numpy as np
+
+from .analytic import overbooked_pmfs
+from .engine import make_rng
+from .fleet import Fleet
+from .solver import solve_profile_booking_limit
+
+# Largest (routes x costs x support) block compared at once
+max_block_size = 4_000_000
+
+
+# Net revenue distribution of one flight on every route (one Fleet entry per route): support points
+# values (routes, K) = revenue - compensation * j for j bumped passengers, with probabilities
+# (routes, K). "exact" uses the binomial bump PMF; "monte_carlo" the bump frequencies of
+# num_simulations simulated flights per route. Points beyond a route's maximum have probability 0.
+def revenue_distribution(fleet, method="exact", num_simulations=1000, rng=None):
+    if method == "exact":
+        probabilities, bumps = overbooked_pmfs(fleet.booked, fleet.seats, fleet.no_show_rate)
+    elif method == "monte_carlo":
+        rng = make_rng(rng)
+        bumps = np.arange(max(0, int(np.max(fleet.booked - fleet.seats))) + 1)
+        counts = np.zeros((fleet.num_flights, len(bumps)))
+        block_size = max(1, max_block_size // fleet.num_flights)
+        for start in range(0, num_simulations, block_size):
+            size = min(block_size, num_simulations - start)
+            show_up = rng.binomial(fleet.booked, 1 - fleet.no_show_rate, size=(size, fleet.num_flights))
+            overbooked = np.maximum(0, show_up - fleet.seats)
+            counts += np.bincount((overbooked + len(bumps) * np.arange(fleet.num_flights)).ravel(),
+                                  minlength=counts.size).reshape(counts.shape)
+        probabilities = counts / num_simulations
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    values = fleet.ticket_revenue[:, None] - fleet.compensation[:, None] * bumps
+    return {"values": values, "probabilities": probabilities}
+
+
+# Profit over a grid of flight costs for every route from its revenue distribution, with no refitting:
+# costs (C,) shared or (routes, C) per route, passengers (routes,) the booked passengers profit is
+# spread over. values are net revenue samples or support points (routes, K) or (K,), e.g. from
+# revenue_distribution or the engines' per-trial outputs; probabilities default to equal weights.
+# The loss probability P(revenue < cost) and expected shortfall E[(cost - revenue)^+] for all
+# (route, cost) pairs come from one broadcasted comparison per block of routes (and of support
+# points, for large sample sets).
+def profit_grid(values, costs, passengers, probabilities=None):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    routes, support = values.shape
+    if probabilities is None:
+        probabilities = np.full(values.shape, 1 / support)
+    probabilities = np.atleast_2d(np.asarray(probabilities, dtype=float))
+    costs = np.broadcast_to(np.asarray(costs, dtype=float), (routes, np.shape(costs)[-1]))
+    passengers = np.broadcast_to(np.asarray(passengers, dtype=float), (routes,))
+
+    expected_revenue = np.sum(probabilities * values, axis=-1)
+    expected_profit = expected_revenue[:, None] - costs
+    prob_loss = np.empty(costs.shape)
+    expected_shortfall = np.empty(costs.shape)
+    route_step = max(1, max_block_size // max(1, costs.shape[1] * support))
+    support_step = max(1, max_block_size // max(1, costs.shape[1]))
+    for start in range(0, routes, route_step):
+        rows = slice(start, start + route_step)
+        prob_loss[rows] = 0.0
+        expected_shortfall[rows] = 0.0
+        for first in range(0, support, support_step):
+            points = slice(first, first + support_step)
+            shortfall = costs[rows, :, None] - values[rows, None, points]
+            weights = probabilities[rows, None, points]
+            prob_loss[rows] += np.sum(weights * (shortfall > 0), axis=-1)
+            expected_shortfall[rows] += np.sum(weights * np.maximum(shortfall, 0), axis=-1)
+
+    # Profit per passenger is linear in cost: d(profit per passenger) / d(cost) = -1 / passengers
+    return {
+        "costs": costs,
+        "expected_revenue": expected_revenue,
+        "std_revenue": np.sqrt(np.maximum(0.0, np.sum(probabilities * values ** 2, axis=-1) - expected_revenue ** 2)),
+        "expected_profit": expected_profit,
+        "profit_per_passenger": expected_profit / passengers[:, None],
+        "break_even_cost": expected_revenue,  # Cost at which expected profit is zero
+        "prob_loss": prob_loss,
+        "expected_shortfall": expected_shortfall,
+        "network_expected_profit": expected_profit.sum(axis=0),
+    }
+
+
+# Profit of a single flight of a profile over a cost grid, booked at booked_per_flight (default: the
+# solver's optimal level). Results are per flight, without the route axis.
+def profile_profit(profile, costs, booked_per_flight=None, method="exact", num_simulations=1000, rng=None):
+    if booked_per_flight is None:
+        booked_per_flight = solve_profile_booking_limit(profile)["best_booking_level"]
+    fleet = Fleet.from_profile(profile, booked_per_flight, num_flights=1)
+    # Monte Carlo: num_simulations days of the profile's flights
+    distribution = revenue_distribution(fleet, method, num_simulations * profile.num_flights, rng)
+    result = profit_grid(distribution["values"], costs, booked_per_flight, distribution["probabilities"])
+    del result["network_expected_profit"]
+    result = {name: value[0] for name, value in result.items()}
+    result["booked_per_flight"] = int(booked_per_flight)
+    result["distribution"] = {name: value[0] for name, value in distribution.items()}
+    return result
@@ -0,0 +1,118 @@
+from statistics import NormalDist
+
+import numpy as np
+
+from .analytic import flight_overbooked_pmf
+from .engine import make_rng, range_counts, upper_bound
+
+# Largest (trials x flights) show-up block drawn at once
+max_block_elements = 4_000_000
+
+
+# Tilted single-flight bump distribution g_j = P(j) exp(theta j) / M(theta) and log M(theta)
+def _tilted_pmf(log_pmf, theta):
+    j = np.arange(len(log_pmf))
+    log_tilted = log_pmf + theta * j
+    log_mgf = np.logaddexp.reduce(log_tilted)
+    return np.exp(log_tilted - log_mgf), log_mgf
+
+
+# Tilt theta >= 0 under which a day is expected to have min_overbooked overbooked passengers
+# (the saddle point of the daily total), found by bisection on the tilted mean
+def saddle_point_tilt(log_pmf, num_flights, min_overbooked, iterations=100):
+    j = np.arange(len(log_pmf))
+    target = min_overbooked / num_flights
+    if np.exp(log_pmf) @ j >= target:
+        return 0.0
+    low, high = 0.0, 1.0
+    while _tilted_pmf(log_pmf, high)[0] @ j < target:
+        high *= 2
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        if _tilted_pmf(log_pmf, mid)[0] @ j < target:
+            low = mid
+        else:
+            high = mid
+    return high
+
+
+# P(overbooked passengers in a day >= min_overbooked) by importance sampling.
+# Each flight's show-up distribution is exponentially tilted towards bumps: the overbooked count j
+# is drawn from P(j) exp(theta j) / M(theta), with theta at the saddle point so the event is typical.
+# The likelihood ratio of a day only depends on its total S:
+#   log w = -theta S + num_flights log M(theta),
+# which is bounded on the event, so the relative error stays bounded however rare the event is.
+# Weights are kept in log space so probabilities far below 1e-300 still come out as log10_probability.
+def tail_probability(booked_per_flight, seats, no_show_rate, num_flights, min_overbooked, num_simulations=1000,
+                     rng=None, tilt=None, confidence=0.95):
+    rng = make_rng(rng)
+    min_overbooked = int(np.ceil(min_overbooked))
+
+    # The event cannot happen (every passenger showing up is not enough)
+    if num_flights * max(0, booked_per_flight - seats) < min_overbooked:
+        return _estimate(np.empty(0), num_simulations, 0.0, confidence)
+    if min_overbooked <= 0:
+        return _estimate(np.zeros(num_simulations), num_simulations, 0.0, confidence)
+
+    with np.errstate(divide='ignore'):
+        log_pmf = np.log(flight_overbooked_pmf(booked_per_flight, seats, no_show_rate))
+    theta = saddle_point_tilt(log_pmf, num_flights, min_overbooked) if tilt is None else tilt
+    tilted, log_mgf = _tilted_pmf(log_pmf, theta)
+    cdf = np.cumsum(tilted)
+
+    block_size = max(1, max_block_elements // num_flights)
+    hit_log_weights = []
+    for start in range(0, num_simulations, block_size):
+        size = min(block_size, num_simulations - start)
+        # Inverse-CDF draw of the overbooked count on every flight
+        overbooked = np.minimum(np.searchsorted(cdf, rng.random((size, num_flights)), side='right'), len(cdf) - 1)
+        per_day = overbooked.sum(axis=-1)
+        hits = per_day[per_day >= min_overbooked]
+        hit_log_weights.append(-theta * hits + num_flights * log_mgf)
+
+    return _estimate(np.concatenate(hit_log_weights), num_simulations, theta, confidence)
+
+
+# Estimate, standard error and normal confidence interval from the log weights of the hits
+def _estimate(hit_log_weights, num_simulations, tilt, confidence):
+    if len(hit_log_weights) == 0:
+        return {"probability": 0.0, "log10_probability": -np.inf, "std_error": 0.0, "ci_low": 0.0, "ci_high": 0.0,
+                "relative_error": np.nan, "num_hits": 0, "effective_sample_size": 0.0, "tilt": tilt}
+
+    # Scale by the largest weight so nothing under- or overflows
+    scale = np.max(hit_log_weights)
+    scaled = np.exp(hit_log_weights - scale)
+    mean_scaled = scaled.sum() / num_simulations
+    var_scaled = max(0.0, (scaled ** 2).sum() / num_simulations - mean_scaled ** 2)
+    relative_error = np.sqrt(var_scaled / num_simulations) / mean_scaled
+
+    log_probability = scale + np.log(mean_scaled)
+    probability = float(np.exp(log_probability))
+    std_error = probability * relative_error
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    return {
+        "probability": probability,
+        "log10_probability": float(log_probability / np.log(10)),
+        "std_error": float(std_error),
+        "ci_low": max(0.0, probability - z * std_error),
+        "ci_high": probability + z * std_error,
+        "relative_error": float(relative_error),
+        "num_hits": len(hit_log_weights),
+        "effective_sample_size": float(scaled.sum() ** 2 / np.sum(scaled ** 2)),
+        "tilt": float(tilt),
+    }
+
+
+# Importance-sampled "P of overbooking > upper bound" for every strategy in {name: booked_per_flight}.
+# Same event as engine.overbooking_range_stats: overbooked / (num_flights * booked) * 100 > upper_bound.
+def tail_probabilities(profile, strategies, num_simulations=1000, rng=None, upper_bound=upper_bound, confidence=0.95):
+    rng = make_rng(rng)
+    results = {}
+    for strategy, booked in strategies.items():
+        min_overbooked = range_counts(booked, profile.num_flights, upper_bound=upper_bound)[1] + 1
+        results[strategy] = tail_probability(booked, profile.seats_per_flight, profile.no_show_rate, profile.num_flights,
+                                             min_overbooked, num_simulations, rng, confidence=confidence)
+        results[strategy]["min_overbooked"] = min_overbooked
+    return results
+
@@ -0,0 +1,119 @@
+import argparse
+import os
+import time
+
+from .parallel import run_tasks
+
+# Chart output used by the scripts when OVERBOOKING_CHARTS is not set
+default_charts = "show"
+
+
+# Where the scripts' charts go: "show" (interactive windows), a directory (files rendered with the
+# non-interactive Agg backend) or None (compute only; the plotting libraries are never imported).
+# The OVERBOOKING_CHARTS environment variable overrides the script's setting ("none" = compute only).
+def chart_output(charts=default_charts):
+    charts = os.environ.get("OVERBOOKING_CHARTS", charts)
+    if charts is None or str(charts).lower() in ("", "none"):
+        return None
+    return charts
+
+
+# One figure to draw: file name (without extension), name of an overbooking.plots function and its arguments
+def chart(name, plot, *args, **kwargs):
+    return (name, plot, args, kwargs)
+
+
+# Worker: draw one chart with Agg and save it
+def _render_chart(task):
+    directory, file_format, dpi, (name, plot, args, kwargs) = task
+    import matplotlib
+    matplotlib.use("Agg")
+    from . import plots
+    fig = getattr(plots, plot)(*args, **kwargs)
+    path = os.path.join(directory, f"{name}.{file_format}")
+    fig.savefig(path, dpi=dpi)
+    plots.pyplot().close(fig)
+    return path
+
+
+# Draw every chart in one pass at the end of a run. With a directory the figures are rendered
+# headless (across num_workers processes) and the file paths returned; "show" opens them all
+# with one blocking plt.show(); None draws nothing.
+def render_charts(charts, specs, file_format="png", dpi=100, num_workers=1):
+    if charts is None or not specs:
+        return []
+    if charts == "show":
+        from . import plots
+        for _, plot, args, kwargs in specs:
+            getattr(plots, plot)(*args, **kwargs)
+        plots.pyplot().show()
+        return []
+    os.makedirs(charts, exist_ok=True)
+    return run_tasks(_render_chart, [(charts, file_format, dpi, spec) for spec in specs], num_workers)
+
+
+# Every chart of the analysis for both profiles: strategy comparison and booking-level revenue
+# curves, overbooking rates, loyalty-loss curves and the sensitivity contours
+def report_charts(method="exact", num_simulations=1000, seed=None):
+    import numpy as np
+
+    from .compensation import clv_cases
+    from .grid import sensitivity_grid
+    from .profiles import domestic_profile, international_profile
+    from .revenue import booking_level_sweep, overbooking_level_sweep, simulate_strategy_revenues
+
+    # Strategies, booking levels and annotation offsets of the Max_Revenue and Optimal_Overbooking scripts
+    settings = {
+        "domestic": (domestic_profile, range(195, 230), range(200, 215), 400, np.arange(1000, 3101, 50),
+                     {"Conservative(0%)": 200, "Moderate(3%)": 206, "Aggressive(5%)": 210, "Extra Aggressive(10%)": 220}),
+        "international": (international_profile, range(395, 465), range(420, 450), 1200, np.arange(4000, 11000, 200),
+                          {"Conservative(0%)": 400, "Moderate(5%)": 420, "Aggressive(10%)": 440, "Extra Aggressive(15%)": 460}),
+    }
+    no_show_rates = np.round(np.linspace(0.00, 0.20, 41), 3)
+
+    specs = []
+    for key, (profile, levels, rate_levels, annotation_offset, compensations, strategies) in settings.items():
+        seats = profile.seats_per_flight
+        revenues = simulate_strategy_revenues(profile, strategies, num_simulations, seed, method)
+        sweep = booking_level_sweep(profile, levels, num_simulations, seed, method)
+        rates = overbooking_level_sweep(profile, rate_levels, num_simulations, seed, method)
+        grid = sensitivity_grid(compensations, no_show_rates, range(seats, seats + 99), seats, profile.class_shares,
+                                profile.economy_price, profile.business_price, profile.first_price)
+        shape = (len(compensations), len(no_show_rates))
+        specs += [
+            chart(f"{key}_strategies", "plot_strategy_comparison", revenues, profile),
+            chart(f"{key}_booking_levels", "plot_booking_levels", sweep, profile, strategies,
+                  annotation_offset=annotation_offset),
+            chart(f"{key}_overbooking_rates", "plot_overbooking_rates", rates, profile),
+            chart(f"{key}_sensitivity", "plot_sensitivity_contour",
+                  grid['Max Expected Net Revenue ($)'].to_numpy().reshape(shape),
+                  grid['Optimal Overbooking Amount'].to_numpy().reshape(shape), no_show_rates, compensations,
+                  f"{profile.name} - Sensitivity Analysis: Max Revenue & Optimal Overbooking"),
+        ]
+    specs.append(chart("loyalty_loss", "plot_loyalty_loss_curves", clv_cases))
+    return specs
+
+
+# python -m overbooking.report --output reports/ renders every chart to files without a display
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the overbooking report charts to files")
+    parser.add_argument("--output", default="reports", help="directory for the chart files")
+    parser.add_argument("--format", default="png", help="image format (png, svg, pdf, ...)")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--method", default="exact", choices=["exact", "monte_carlo", "kernel"])
+    parser.add_argument("--num-simulations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1, help="processes rendering charts (0 = all cores)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    specs = report_charts(args.method, args.num_simulations, args.seed)
+    computed = time.perf_counter()
+    paths = render_charts(args.output, specs, args.format, args.dpi, args.workers or None)
+    for path in paths:
+        print(path)
+    print(f"{len(paths)} charts: compute {computed - start:.2f}s, render {time.perf_counter() - computed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytic import exact_range_stats, expected_overbooked, overbooked_moments
+from .classes import simulate_class_bumps
+from .engine import lower_bound, make_rng, overbooking_range_stats, simulate_overbooked_per_day, simulate_strategies, upper_bound
+from .kernels import kernel_overbooked_per_day
+from .parallel import simulate_levels_parallel
+
+
+# Average net revenue and overbooked passengers per flight at one booking level.
+# "monte_carlo" simulates num_simulations days, "exact" uses the binomial tail and "kernel" simulates
+# with the fused kernels of overbooking.kernels (Numba when installed). With a
+# classes.ClassBumpModel, show-ups are drawn per fare class and bumps are charged by
+# class and voluntary/involuntary instead of a flat compensation_per_passenger.
+def run_simulation(profile, booked_per_flight, num_simulations=1000, rng=None, method="monte_carlo", bump_model=None):
+    if bump_model is not None:
+        if method != "monte_carlo":
+            raise ValueError("bump_model needs method='monte_carlo'")
+        result = simulate_class_bumps(profile, booked_per_flight, bump_model, num_simulations, rng)
+        return result["avg_net_revenue"], result["avg_overbooked_passengers"]
+
+    revenue_per_flight = profile.ticket_revenue(booked_per_flight)
+
+    if method == "exact":
+        avg_overbooked = expected_overbooked(booked_per_flight, profile.seats_per_flight, profile.no_show_rate)
+    elif method == "monte_carlo":
+        overbooked_per_day = simulate_overbooked_per_day(booked_per_flight, profile.seats_per_flight, profile.no_show_rate,
+                                                         profile.num_flights, num_simulations, rng)
+        avg_overbooked = np.mean(overbooked_per_day) / profile.num_flights
+    elif method == "kernel":
+        overbooked_per_day = kernel_overbooked_per_day(booked_per_flight, profile.seats_per_flight, profile.no_show_rate,
+                                                       profile.num_flights, num_simulations, rng)
+        avg_overbooked = np.mean(overbooked_per_day) / profile.num_flights
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    return float(revenue_per_flight - profile.compensation_per_passenger * avg_overbooked), float(avg_overbooked)
+
+
+# Average net revenue per flight for every strategy in {name: booked_per_flight}
+def simulate_strategy_revenues(profile, strategies, num_simulations=1000, rng=None, method="monte_carlo", bump_model=None):
+    rng = make_rng(rng)
+    return {strategy: run_simulation(profile, booked_per_flight, num_simulations, rng, method, bump_model)[0]
+            for strategy, booked_per_flight in strategies.items()}
+
+
+# Stochastic part of a booking-level sweep: overbooked passengers per level. It depends only
+# on seats, no-show rate and flights per day, so fare and compensation what-ifs are re-scored
+# from it without new draws.
+@dataclass(frozen=True)
+class BumpStatistics:
+    booking_levels: np.ndarray
+    seats_per_flight: int
+    no_show_rate: float
+    num_flights: int
+    avg_overbooked: np.ndarray  # Mean overbooked passengers per flight
+    var_overbooked_per_day: np.ndarray  # Variance of the daily overbooked total
+
+    # Whether a profile shares the stochastic parameters these statistics were drawn with
+    def matches(self, profile):
+        return (profile.seats_per_flight == self.seats_per_flight and profile.no_show_rate == self.no_show_rate
+                and profile.num_flights == self.num_flights)
+
+
+# Bump statistics for every booking level; Monte Carlo levels are fanned out across num_workers processes,
+# "kernel" levels run one after another with their trials spread over Numba's threads
+def bump_statistics(profile, booking_levels, num_simulations=1000, seed=None, method="monte_carlo", num_workers=1):
+    booking_levels = np.asarray(list(booking_levels))
+    seats, no_show_rate, num_flights = profile.seats_per_flight, profile.no_show_rate, profile.num_flights
+
+    if method == "exact":
+        avg_overbooked, var_overbooked = overbooked_moments(booking_levels, seats, no_show_rate)
+        var_per_day = num_flights * var_overbooked
+    elif method == "monte_carlo":
+        overbooked_by_level = simulate_levels_parallel(booking_levels.tolist(), seats, no_show_rate, num_flights,
+                                                       num_simulations, seed, num_workers)
+        per_day = [overbooked_by_level[b] for b in booking_levels.tolist()]
+        avg_overbooked = np.array([np.mean(d) for d in per_day]) / num_flights
+        var_per_day = np.array([np.var(d, ddof=1) if len(d) > 1 else 0.0 for d in per_day])
+    elif method == "kernel":
+        per_day = kernel_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, seed)
+        avg_overbooked = per_day.mean(axis=1) / num_flights
+        var_per_day = per_day.var(axis=1, ddof=1) if num_simulations > 1 else np.zeros(len(booking_levels))
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    return BumpStatistics(booking_levels, seats, no_show_rate, num_flights, avg_overbooked, var_per_day)
+
+
+# Net revenue curve for a profile's fares and compensation from stored bump statistics
+def rescore(stats, profile):
+    if not stats.matches(profile):
+        raise ValueError("Profile seats, no-show rate or flights differ from the bump statistics; re-simulate instead")
+
+    compensation = profile.compensation_per_passenger
+    avg_net_revenue = profile.ticket_revenue(stats.booking_levels) - compensation * stats.avg_overbooked
+    best = int(np.argmax(avg_net_revenue))
+    return {
+        "booking_levels": stats.booking_levels,
+        "avg_net_revenue": avg_net_revenue,
+        "std_net_revenue": compensation / stats.num_flights * np.sqrt(stats.var_overbooked_per_day),
+        "avg_overbooked_passengers": stats.avg_overbooked,
+        "best_booking_level": int(stats.booking_levels[best]),
+        "best_revenue": float(avg_net_revenue[best]),
+    }
+
+
+# Best booking level and revenue for many compensation values at once (one broadcasted operation)
+def rescore_compensations(stats, profile, compensations):
+    if not stats.matches(profile):
+        raise ValueError("Profile seats, no-show rate or flights differ from the bump statistics; re-simulate instead")
+
+    compensations = np.asarray(compensations, dtype=float)
+    net_revenue = profile.ticket_revenue(stats.booking_levels) - compensations[..., None] * stats.avg_overbooked
+    best = np.argmax(net_revenue, axis=-1)
+    return {
+        "compensations": compensations,
+        "best_booking_level": stats.booking_levels[best],
+        "best_revenue": np.max(net_revenue, axis=-1),
+    }
+
+
+# Net revenue curve over booking levels with the best level and its revenue
+def booking_level_sweep(profile, booking_levels, num_simulations=1000, seed=None, method="monte_carlo", num_workers=1):
+    return rescore(bump_statistics(profile, booking_levels, num_simulations, seed, method, num_workers), profile)
+
+
+# Overbooking range probabilities for every strategy in {name: booked_per_flight}
+def strategy_overbooking_probabilities(profile, strategies, num_simulations=1000, rng=None, method="monte_carlo",
+                                       lower_bound=lower_bound, upper_bound=upper_bound):
+    return simulate_strategies(strategies, profile.seats_per_flight, profile.no_show_rate, profile.num_flights,
+                               num_simulations, make_rng(rng), lower_bound, upper_bound, method)
+
+
+# Range probabilities for every booking level and the level most likely to land in range
+def overbooking_level_sweep(profile, booking_levels, num_simulations=1000, seed=None, method="monte_carlo",
+                            num_workers=1, lower_bound=lower_bound, upper_bound=upper_bound):
+    booking_levels = list(booking_levels)
+    if method == "exact":
+        results = {b: exact_range_stats(b, profile.seats_per_flight, profile.no_show_rate, profile.num_flights, lower_bound, upper_bound)
+                   for b in booking_levels}
+    elif method == "monte_carlo":
+        overbooked_by_level = simulate_levels_parallel(booking_levels, profile.seats_per_flight, profile.no_show_rate,
+                                                       profile.num_flights, num_simulations, seed, num_workers)
+        results = {b: overbooking_range_stats(overbooked_by_level[b], b, profile.num_flights, lower_bound, upper_bound)
+                   for b in booking_levels}
+    elif method == "kernel":
+        per_day = kernel_overbooked_per_day(booking_levels, profile.seats_per_flight, profile.no_show_rate,
+                                            profile.num_flights, num_simulations, seed)
+        results = {b: overbooking_range_stats(d, b, profile.num_flights, lower_bound, upper_bound)
+                   for b, d in zip(booking_levels, per_day)}
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    # Best level: highest probability of landing within range (first one on ties)
+    best = None
+    for b in booking_levels:
+        if results[b]["prob_within_range"] > 0 and (best is None or results[b]["prob_within_range"] > results[best]["prob_within_range"]):
+            best = b
+    return {
+        "results": results,
+        "best_booking_level": best,
+        "best_avg_overbooking_rate": results[best]["avg_overbooking_rate"] if best is not None else 0,
+    }
@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from .analytic import bump_probability, expected_overbooked
+from .profiles import ticket_counts
+from .solver import default_max_extra, expected_overbooked_curve
+
+# Scenario fields and defaults (domestic fare mix)
+scenario_defaults = {
+    "business_multiplier": 4,
+    "first_multiplier": 6,
+    "class_shares": (0.85, 0.10, 0.05),
+    "extra_business_share": 0.10,
+    "extra_economy_share": 0.90,
+}
+required_fields = ("seats", "booked", "no_show_rate", "compensation", "economy_price")
+
+# Most levels above capacity one scenario may span, both the levels searched (default_max_extra
+# grows like seats / (1 - no_show_rate)) and booked - seats, so near-certain no-shows, huge flights
+# or huge bookings are rejected instead of allocated
+max_levels = 100_000
+
+
+# Scenario as a hashable tuple with defaults filled in (also the LRU key)
+def normalize_scenario(scenario):
+    if not isinstance(scenario, dict):
+        raise ValueError("Scenario must be a JSON object")
+    missing = [name for name in required_fields if name not in scenario]
+    if missing:
+        raise ValueError(f"Missing scenario fields: {', '.join(missing)}")
+    merged = {**scenario_defaults, **scenario}
+    seats, booked = int(merged["seats"]), int(merged["booked"])
+    no_show_rate = float(merged["no_show_rate"])
+    if seats <= 0 or booked < 0 or not 0 <= no_show_rate < 1:
+        raise ValueError("Expected seats > 0, booked >= 0 and 0 <= no_show_rate < 1")
+    class_shares = tuple(float(share) for share in merged["class_shares"])
+    if len(class_shares) != 3:
+        raise ValueError("Expected three class_shares (economy, business, first)")
+    if default_max_extra(seats, no_show_rate) > max_levels:
+        raise ValueError(f"Too many booking levels to search for seats={seats} and no_show_rate={no_show_rate} "
+                         f"(at most {max_levels})")
+    if booked - seats > max_levels:
+        raise ValueError(f"Expected booked - seats <= {max_levels}")
+    values = {name: float(merged[name]) for name in ("compensation", "economy_price", "business_multiplier",
+                                                      "first_multiplier", "extra_business_share", "extra_economy_share")}
+    not_finite = [name for name, value in values.items() if not np.isfinite(value)]
+    if not_finite or not np.all(np.isfinite(class_shares)):
+        raise ValueError(f"Expected finite values: {', '.join(not_finite or ['class_shares'])}")
+    return (seats, booked, no_show_rate, values["compensation"], values["economy_price"], values["business_multiplier"],
+            values["first_multiplier"], class_shares, values["extra_business_share"], values["extra_economy_share"])
+
+
+# Ticket revenue per flight for booked (batch, levels), FlightProfile's rule (profiles.ticket_counts)
+# with one row of fares and class shares per scenario
+def _ticket_revenue(booked, seats, economy_price, business_multiplier, first_multiplier, class_shares,
+                    extra_business_share, extra_economy_share):
+    economy, business, first = ticket_counts(booked, seats, class_shares[:, None, :], extra_business_share,
+                                             extra_economy_share)
+    return economy_price * (economy + business_multiplier * business + first_multiplier * first)
+
+
+# Levels searched above capacity for one scenario
+def _max_extra(scenario):
+    seats, _, no_show_rate = scenario[:3]
+    return default_max_extra(seats, no_show_rate)
+
+
+# Levels above capacity a scenario's arrays span: the levels searched and its own booking
+def _level_span(scenario):
+    seats, booked = scenario[:2]
+    return max(_max_extra(scenario), booked - seats, 1)
+
+
+# Evaluate a batch of normalized scenarios, in input order. Scenarios are grouped by their level
+# span rounded up to a power of two, so one high no-show rate or booking does not size the arrays
+# of every other scenario in the batch.
+def evaluate_batch(scenarios):
+    groups = {}
+    for i, scenario in enumerate(scenarios):
+        groups.setdefault((_level_span(scenario) - 1).bit_length(), []).append(i)
+    results = [None] * len(scenarios)
+    for indices in groups.values():
+        for i, result in zip(indices, _evaluate_group([scenarios[i] for i in indices])):
+            results[i] = result
+    return results
+
+
+# Evaluate scenarios in one vectorized pass; each searches its own levels seats..seats + _max_extra
+def _evaluate_group(scenarios):
+    columns = list(zip(*scenarios))
+    seats, booked, no_show_rate, compensation, economy_price, business_multiplier, first_multiplier = (
+        np.array(columns[i], dtype=float)[:, None] for i in range(7))
+    class_shares = np.array(columns[7], dtype=float)
+    extra_business_share = np.array(columns[8])[:, None]
+    extra_economy_share = np.array(columns[9])[:, None]
+    fare_args = (economy_price, business_multiplier, first_multiplier, class_shares, extra_business_share, extra_economy_share)
+
+    seats_i, booked_i = seats[:, 0].astype(np.int64), booked[:, 0].astype(np.int64)
+    overbooked = expected_overbooked(booked_i, seats_i, no_show_rate[:, 0])
+    net_revenue = _ticket_revenue(booked, seats, *fare_args)[:, 0] - compensation[:, 0] * overbooked
+
+    # Optimal level: revenue curve from capacity upwards for every scenario at once, with levels
+    # past a scenario's own max_extra masked out (so the answer does not depend on the batch)
+    own_max_extra = np.array([_max_extra(scenario) for scenario in scenarios])
+    max_extra = int(own_max_extra.max())
+    curve, _ = expected_overbooked_curve(seats_i, no_show_rate[:, 0], max_extra)
+    levels = seats + np.arange(max_extra + 1)
+    revenue_curve = _ticket_revenue(levels, seats, *fare_args) - compensation * curve
+    revenue_curve[np.arange(max_extra + 1) > own_max_extra[:, None]] = -np.inf
+    best = np.argmax(revenue_curve, axis=1)
+
+    return [
+        {
+            "expected_net_revenue": float(net_revenue[i]),
+            "expected_overbooked": float(overbooked[i]),
+            "bump_probability": float(p),
+            "optimal_booking_level": int(levels[i, best[i]]),
+            "optimal_revenue": float(revenue_curve[i, best[i]]),
+        }
+        for i, p in enumerate(bump_probability(booked_i, seats_i, no_show_rate[:, 0]))
+    ]
+
+
+# Collects requests arriving within batch_window seconds into one evaluate_batch call and
+# serves repeated scenarios from an in-memory LRU
+class BatchingEvaluator:
+    def __init__(self, batch_window=0.002, max_batch=1024, cache_size=10_000):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.queue = None
+        self.worker = None
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+
+    async def evaluate(self, scenario):
+        key = normalize_scenario(scenario)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((key, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Evaluate each distinct scenario once. If the batch fails, each scenario is retried on
+            # its own so only the requests for the failing ones get the exception.
+            keys = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                results = dict(zip(keys, evaluate_batch(keys)))
+            except Exception:
+                results = {}
+                for key in keys:
+                    try:
+                        results[key] = evaluate_batch([key])[0]
+                    except Exception as exc:
+                        results[key] = exc
+
+            for key, result in results.items():
+                if not isinstance(result, Exception):
+                    self.cache[key] = result
+                    self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+            for key, future in batch:
+                if future.done():
+                    continue
+                if isinstance(results[key], Exception):
+                    future.set_exception(results[key])
+                else:
+                    future.set_result(results[key])
+
+
+# Minimal HTTP/1.1 JSON front end:
+#   POST /evaluate  {scenario} or [{scenario}, ...]
+#   GET  /health
+class OverbookingService:
+    def __init__(self, evaluator=None):
+        self.evaluator = evaluator or BatchingEvaluator()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self.route(method, path, body)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return "200 OK", {"status": "ok", "cached_scenarios": len(self.evaluator.cache)}
+        if method != "POST" or path != "/evaluate":
+            return "404 Not Found", {"error": f"No route for {method} {path}"}
+        try:
+            request = json.loads(body or b"null")
+            if isinstance(request, list):
+                return "200 OK", list(await asyncio.gather(*(self.evaluator.evaluate(s) for s in request)))
+            return "200 OK", await self.evaluator.evaluate(request)
+        except (ValueError, TypeError) as exc:
+            return "400 Bad Request", {"error": str(exc)}
+        except Exception as exc:
+            return "500 Internal Server Error", {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self.evaluator.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.evaluator.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local what-if service for the overbooking revenue model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to wait for more requests")
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    service = OverbookingService(BatchingEvaluator(args.batch_window, cache_size=args.cache_size))
+    print(f"Serving on http://{args.host}:{args.port} (POST /evaluate, GET /health)")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+# Booking levels searched above capacity when no limit is given: twice the
+# expected no-show count plus a margin
+def default_max_extra(seats, no_show_rate):
+    show_prob = 1 - np.max(no_show_rate)
+    return int(np.ceil(2 * np.max(seats) * (1 / max(show_prob, 1e-9) - 1))) + 20
+
+
+# Expected overbooked passengers E[(X_n - seats)^+] and P(X_n >= seats) for
+# n = seats, seats + 1, ..., seats + max_extra, X_n ~ Binomial(n, 1 - no_show_rate).
+# Each level reuses the previous one in O(1):
+#   E_{n+1} = E_n + p P(X_n >= s),  P(X_{n+1} >= s) = P(X_n >= s) + p P(X_n = s - 1),
+#   P(X_{n+1} = s - 1) = P(X_n = s - 1) q (n + 1) / (n + 2 - s)
+# seats and no_show_rate may be arrays (one entry per flight); levels go on the last axis.
+def expected_overbooked_curve(seats, no_show_rate, max_extra):
+    seats = np.asarray(seats, dtype=float)
+    p = 1 - np.asarray(no_show_rate, dtype=float)
+    seats, p = np.broadcast_arrays(seats, p)
+    q = 1 - p
+
+    expected = np.zeros(seats.shape + (max_extra + 1,))
+    tail = np.zeros(seats.shape + (max_extra + 1,))
+
+    with np.errstate(divide='ignore', invalid='ignore', under='ignore'):
+        # n = seats: P(X >= s) = p^s, P(X = s - 1) = s p^(s-1) q
+        tail[..., 0] = np.exp(seats * np.log(p))
+        below = np.where(q > 0, seats * np.exp((seats - 1) * np.log(p)) * q, 0.0)
+        below = np.nan_to_num(below)
+
+    n = seats.copy()
+    for e in range(max_extra):
+        expected[..., e + 1] = expected[..., e] + p * tail[..., e]
+        tail[..., e + 1] = tail[..., e] + p * below
+        below = below * q * (n + 1) / (n + 2 - seats)
+        n += 1
+    return expected, tail
+
+
+# Net revenue curve over booking levels from seats to seats + max_extra and its optimum.
+# ticket_revenue(booking_levels) gives the ticket revenue per flight for an array of levels.
+def solve_booking_limit(seats, no_show_rate, compensation, ticket_revenue, max_extra=None):
+    if max_extra is None:
+        max_extra = default_max_extra(seats, no_show_rate)
+    booking_levels = seats + np.arange(max_extra + 1)
+    expected, tail = expected_overbooked_curve(seats, no_show_rate, max_extra)
+    avg_net_revenue = ticket_revenue(booking_levels) - compensation * expected
+
+    best = int(np.argmax(avg_net_revenue))
+    return {
+        "booking_levels": booking_levels,
+        "avg_net_revenue": avg_net_revenue,
+        "avg_overbooked_passengers": expected,
+        "prob_full": tail,
+        "best_booking_level": int(booking_levels[best]),
+        "best_revenue": float(avg_net_revenue[best]),
+    }
+
+
+# solve_booking_limit for a FlightProfile (fare mix taken from the profile)
+def solve_profile_booking_limit(profile, max_extra=None):
+    return solve_booking_limit(profile.seats_per_flight, profile.no_show_rate, profile.compensation_per_passenger,
+                               profile.ticket_revenue, max_extra)
+
+
+# Newsvendor stopping rule: keep selling while the marginal fare exceeds the expected
+# marginal compensation c p P(X_n >= seats). Vectorized over flights; returns the booking limit
+# per flight (the first n where one more ticket no longer pays for itself).
+def marginal_booking_limit(seats, no_show_rate, compensation, marginal_fare, max_extra=None):
+    if max_extra is None:
+        max_extra = default_max_extra(seats, no_show_rate)
+    seats = np.asarray(seats)
+    p = 1 - np.asarray(no_show_rate, dtype=float)
+    _, tail = expected_overbooked_curve(seats, no_show_rate, max_extra)
+
+    marginal_cost = (np.asarray(compensation, dtype=float) * p)[..., None] * tail
+    stop = marginal_cost >= np.asarray(marginal_fare, dtype=float)[..., None]
+    extra = np.where(stop.any(axis=-1), np.argmax(stop, axis=-1), max_extra)
+    return seats + extra
@@ -0,0 +1,161 @@
+import numpy as np
+
+from .engine import lower_bound, make_rng, upper_bound
+
+# Largest show-up block (days x flights) drawn at once; bounds peak memory
+max_block_elements = 2_000_000
+
+
+# Running mean/variance over chunks (Chan et al. parallel update of Welford's algorithm)
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        n = values.size
+        if n == 0:
+            return self
+        chunk_mean = values.mean()
+        chunk_m2 = np.sum((values - chunk_mean) ** 2)
+
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def standard_error(self):
+        return self.std / np.sqrt(self.count) if self.count > 0 else np.inf
+
+
+# Exact histogram of non-negative integer outcomes (e.g. overbooked passengers per day).
+# Memory grows with the largest value seen, not with the number of trials.
+class IntegerHistogram:
+    def __init__(self):
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, values):
+        counts = np.bincount(np.asarray(values, dtype=np.int64).ravel())
+        if len(counts) > len(self.counts):
+            counts[:len(self.counts)] += self.counts
+            self.counts = counts
+        else:
+            self.counts[:len(counts)] += counts
+        return self
+
+    def quantile(self, q):
+        cdf = np.cumsum(self.counts) / max(1, self.counts.sum())
+        return np.searchsorted(cdf, np.asarray(q) - 1e-12)
+
+
+# Fixed-bin histogram of real-valued outcomes (e.g. per-passenger costs) with
+# under/overflow counters; quantiles are linearly interpolated inside a bin.
+class Histogram:
+    def __init__(self, low, high, bins=1000):
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        self.underflow += np.count_nonzero(values < self.edges[0])
+        self.overflow += np.count_nonzero(values > self.edges[-1])
+        self.counts += np.histogram(values, self.edges)[0]
+        return self
+
+    def quantile(self, q):
+        total = self.counts.sum() + self.underflow + self.overflow
+        cdf = (self.underflow + np.concatenate(([0], np.cumsum(self.counts)))) / max(1, total)
+        return np.interp(q, cdf, self.edges)
+
+
+# Feed draw_chunk(rng, size) -> array through running statistics in fixed-size chunks.
+# Stops early once the standard error of the mean drops below tolerance.
+def stream_statistic(draw_chunk, num_trials, chunk_size=10_000, rng=None, tolerance=None,
+                     histogram=None, min_trials=100):
+    rng = make_rng(rng)
+    stats = RunningStats()
+    done = 0
+    while done < num_trials:
+        size = min(chunk_size, num_trials - done)
+        values = draw_chunk(rng, size)
+        stats.update(values)
+        if histogram is not None:
+            histogram.update(values)
+        done += size
+        if tolerance is not None and stats.count >= min_trials and stats.standard_error <= tolerance:
+            break
+    return stats
+
+
+# Overbooked passengers per day for `days` days, drawn in blocks of at most
+# max_block_elements show-up counts (flights are split when a day is too large)
+def _draw_overbooked_days(rng, booked_per_flight, seats, no_show_rate, num_flights, days):
+    totals = np.zeros(days, dtype=np.int64)
+    flights_per_block = max(1, min(num_flights, max_block_elements // max(1, days)))
+    for start in range(0, num_flights, flights_per_block):
+        flights = min(flights_per_block, num_flights - start)
+        show_up = rng.binomial(booked_per_flight, 1 - no_show_rate, size=(days, flights))
+        totals += np.maximum(0, show_up - seats).sum(axis=1)
+    return totals
+
+
+# Streaming counterpart of engine.simulate_overbooked_per_day + overbooking_range_stats.
+# Peak memory is set by chunk_size and max_block_elements, not by num_simulations.
+def stream_overbooking_stats(booked_per_flight, seats, no_show_rate, num_flights, num_simulations,
+                             chunk_size=None, rng=None, tolerance=None,
+                             lower_bound=lower_bound, upper_bound=upper_bound,
+                             quantiles=(0.5, 0.9, 0.99)):
+    if chunk_size is None:
+        chunk_size = max(1, max_block_elements // num_flights)
+    total_passengers_per_day = num_flights * booked_per_flight
+    histogram = IntegerHistogram()
+    within = above = below = 0
+
+    def draw_chunk(rng, size):
+        nonlocal within, above, below
+        per_day = _draw_overbooked_days(rng, booked_per_flight, seats, no_show_rate, num_flights, size)
+        overbooking_rate_per_passenger = per_day / total_passengers_per_day * 100
+        within += np.count_nonzero((overbooking_rate_per_passenger >= lower_bound) & (overbooking_rate_per_passenger <= upper_bound))
+        above += np.count_nonzero(overbooking_rate_per_passenger > upper_bound)
+        below += np.count_nonzero(overbooking_rate_per_passenger < lower_bound)
+        return per_day
+
+    stats = stream_statistic(draw_chunk, num_simulations, chunk_size, rng, tolerance, histogram)
+
+    avg_overbooking_rate = stats.mean / total_passengers_per_day * 100
+    if avg_overbooking_rate > 0:
+        one_in_x_passengers = round(1 / (avg_overbooking_rate / 100))
+    else:
+        one_in_x_passengers = None
+
+    return {
+        "prob_within_range": within / stats.count * 100,
+        "prob_above_range": above / stats.count * 100,
+        "prob_below_range": below / stats.count * 100,
+        "avg_overbooking_rate": avg_overbooking_rate,
+        "one_in_x_passengers": one_in_x_passengers,
+        "num_simulations": stats.count,
+        "mean_overbooked_per_day": stats.mean,
+        "std_overbooked_per_day": stats.std,
+        "standard_error": stats.standard_error,
+        "quantiles": dict(zip(quantiles, histogram.quantile(quantiles).tolist())),
+    }
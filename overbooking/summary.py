@@ -0,0 +1,57 @@
+from .engine import lower_bound, range_counts, upper_bound
+
+
+# Text report of the overbooking range probabilities per strategy (P_Overbooking output). The
+# bounds are % of booked passengers, so the passenger counts in the labels follow each strategy's
+# booking level (engine.range_counts, the same counts format_tail_report shows).
+def format_range_report(results, profile, booking_levels, lower_bound=lower_bound, upper_bound=upper_bound):
+    lines = []
+    for strategy, stats in results.items():
+        lower_bound_people, upper_bound_people = range_counts(booking_levels[strategy], profile.num_flights,
+                                                              lower_bound, upper_bound)
+        one_in_x_passengers = stats["one_in_x_passengers"]
+        lines.append(f"\n{strategy} Strategy:")
+        lines.append(f"P of overbooking between {lower_bound_people} - {upper_bound_people} passengers: \t\t{stats['prob_within_range']:.2f}%")
+        lines.append(f"P of overbooking > {upper_bound_people} passengers: \t\t\t{stats['prob_above_range']:.2f}%")
+        lines.append(f"P of overbooking < {lower_bound_people} passengers: \t\t\t{stats['prob_below_range']:.2f}%")
+        lines.append(f"Estimated overbooking rate per passenger: \t\t{stats['avg_overbooking_rate']:.3f}%")
+        lines.append(f"\nOverbooking likelihood: " + (f"1 in {one_in_x_passengers} passengers get overbooked." if one_in_x_passengers else "No overbookings"))
+    return "\n".join(lines)
+
+
+# Average net revenue per strategy, one line each
+def format_strategy_revenues(revenues_by_strategy):
+    return "\n".join(f"{strategy}: ${revenue:,.2f}" for strategy, revenue in revenues_by_strategy.items())
+
+
+# Best booking level of a revenue sweep
+def format_booking_level_summary(sweep, profile):
+    best_booking_level = sweep["best_booking_level"]
+    best_booking_percentage = ((best_booking_level - profile.seats_per_flight) / profile.seats_per_flight) * 100
+    return (f"Optimal overbooking level: {best_booking_level} passengers per flight "
+            f"({best_booking_percentage}% overbooked) with the revenue being ${sweep['best_revenue']:,.2f}")
+
+
+# Simulation budget and confidence of an adaptive race (overbooking.adaptive)
+def format_race_summary(race):
+    share = race["total_simulations"] / race["full_sweep_simulations"] * 100
+    status = "identified" if race["identified"] else "not separated from the runner-up within the budget"
+    return (f"Adaptive search: {race['total_simulations']:,} simulated days ({share:.0f}% of a full sweep) in "
+            f"{race['rounds']} round{'s' if race['rounds'] != 1 else ''}, best level {status}, P(best) >= {race['prob_best']:.3f}")
+
+
+# Importance-sampled "> upper bound" probabilities with confidence intervals, one line each
+def format_tail_report(tails, confidence=0.95):
+    lines = []
+    for strategy, tail in tails.items():
+        label = f"{strategy}: P of overbooking > {tail['min_overbooked'] - 1} passengers"
+        if tail["num_hits"] == 0:
+            lines.append(f"{label}: 0 (no simulated day reached it)")
+        elif tail["probability"] == 0:
+            lines.append(f"{label}: ~10^{tail['log10_probability']:.1f} (relative error {tail['relative_error']:.1%})")
+        else:
+            days = 1 / tail["probability"]
+            one_in = f"{days:,.0f}" if days < 1e9 else f"{days:.2e}"
+            lines.append(f"{label}: {tail['probability']:.3e} ({confidence:.0%} CI {tail['ci_low']:.3e} - {tail['ci_high']:.3e}), "
+                         f"1 in {one_in} days")
+    return "\n".join(lines)
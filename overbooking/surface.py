@@ -0,0 +1,174 @@
+import itertools
+import json
+import os
+from dataclasses import asdict
+
+import numpy as np
+
+from .engine import engine_version
+from .grid import expected_overbooked_table, max_block_size, ticket_revenue
+from .profiles import FlightProfile
+from .solver import default_max_extra
+
+# Axes of a surface, in storage order
+axis_names = ("seats", "no_show_rate", "compensation", "fare_ratio")
+
+# Arrays stored as .npy files next to surface.json
+surface_arrays = ("optimal_booking_level", "max_revenue")
+
+# Offsets (0 or 1 per axis) of the 2^4 grid points around a query
+corners = np.array(list(itertools.product((0, 1), repeat=len(axis_names))))
+
+# How far past the first or last grid point (in grid steps) a query still counts as on the axis
+off_axis_tolerance = 1e-9
+
+
+# Element strides of a C-ordered array of the given shape
+def _strides(shape):
+    return np.concatenate((np.cumprod(np.asarray(shape)[:0:-1])[::-1], [1])).astype(np.int64)
+
+
+# Regular grid axis start + step * i, i = 0..num-1, so a value's cell is found by arithmetic (O(1))
+def _regular_axis(name, values):
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 1 or len(values) == 0:
+        raise ValueError(f"Axis {name} needs at least one value")
+    step = float(values[1] - values[0]) if len(values) > 1 else 1.0
+    if step <= 0 or not np.allclose(np.diff(values), step, rtol=1e-9, atol=1e-12):
+        raise ValueError(f"Axis {name} must be increasing and evenly spaced")
+    return {"start": float(values[0]), "step": step, "num": len(values)}
+
+
+# Optimal booking level and max expected net revenue per flight over
+# (seats, no-show rate, compensation, fare ratio), built once and then queried by index or by
+# multilinear interpolation. The fare ratio scales all of the profile's fares (1 = profile fares).
+# Arrays can be memory-mapped (load), so a lookup only touches the 16 cells around the query.
+class BookingSurface:
+    def __init__(self, axes, optimal_booking_level, max_revenue, profile, method):
+        self.axes = axes
+        self.optimal_booking_level = optimal_booking_level
+        self.max_revenue = max_revenue
+        self.profile = profile
+        self.method = method
+
+    @property
+    def shape(self):
+        return tuple(self.axes[name]["num"] for name in axis_names)
+
+    def axis_values(self, name):
+        axis = self.axes[name]
+        return axis["start"] + axis["step"] * np.arange(axis["num"])
+
+    # Stored values at grid indices (arrays broadcast)
+    def at(self, seats_index, no_show_index, compensation_index, fare_index):
+        index = (seats_index, no_show_index, compensation_index, fare_index)
+        return {
+            "optimal_booking_level": self.optimal_booking_level[index],
+            "max_revenue": self.max_revenue[index],
+        }
+
+    # Multilinear interpolation between the 2^4 surrounding grid points. Queries outside the
+    # axes (beyond rounding) give NaN rather than the nearest edge, whose optimum would be wrong.
+    # Inputs broadcast, so a batch of queries is one call. The interpolated booking level is
+    # fractional; round it to book.
+    def lookup(self, seats, no_show_rate, compensation, fare_ratio=1.0):
+        values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (seats, no_show_rate, compensation, fare_ratio)))
+        start, step, num = (np.array([self.axes[name][key] for name in axis_names]) for key in ("start", "step", "num"))
+        position = (np.stack(values).reshape(len(axis_names), -1) - start[:, None]) / step[:, None]
+        outside = np.any((position < -off_axis_tolerance) | (position > (num - 1)[:, None] + off_axis_tolerance), axis=0)
+        position = np.clip(position, 0, (num - 1)[:, None])
+        low = np.minimum(np.floor(position), np.maximum(0, num - 2)[:, None])
+        t = position - low
+
+        # Flat offsets and weights of the 16 corners, (corners, queries)
+        index = np.minimum(low[None] + corners[..., None], (num - 1)[None, :, None]).astype(np.int64)
+        flat = np.einsum('cak,a->ck', index, _strides(num))
+        weight = np.prod(np.where(corners[..., None] == 1, t[None], 1 - t[None]), axis=1)
+        level = np.where(outside, np.nan, np.einsum('ck,ck->k', weight, np.ravel(self.optimal_booking_level)[flat]))
+        revenue = np.where(outside, np.nan, np.einsum('ck,ck->k', weight, np.ravel(self.max_revenue)[flat]))
+        level, revenue = level.reshape(values[0].shape), revenue.reshape(values[0].shape)
+
+        if level.ndim == 0:
+            return {"optimal_booking_level": float(level), "max_revenue": float(revenue)}
+        return {"optimal_booking_level": level, "max_revenue": revenue}
+
+    # Arrays as .npy files plus surface.json (axes, profile, method); the metadata is written
+    # last, so a directory with surface.json always has complete arrays
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in surface_arrays:
+            tmp_path = os.path.join(directory, f"{name}.tmp.npy")
+            np.save(tmp_path, np.asarray(getattr(self, name)))
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+        metadata = {"axes": self.axes, "profile": asdict(self.profile), "method": self.method,
+                    "engine_version": engine_version}
+        tmp_path = os.path.join(directory, "surface.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(tmp_path, os.path.join(directory, "surface.json"))
+
+    # Surface saved by save(); arrays are memory-mapped read-only by default (mmap_mode=None reads them in)
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(os.path.join(directory, "surface.json")) as f:
+            metadata = json.load(f)
+        profile_fields = metadata["profile"]
+        profile_fields["class_shares"] = tuple(profile_fields["class_shares"])
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in surface_arrays}
+        return cls(metadata["axes"], arrays["optimal_booking_level"], arrays["max_revenue"],
+                   FlightProfile(**profile_fields), metadata["method"])
+
+
+# Build the surface for a profile's fare mix and class split over evenly spaced axes.
+# Expected overbooking is computed once per (seats, no-show rate) and every (compensation,
+# fare ratio) pair is scored in one broadcasted operation, as in grid.solve_grid:
+# net[n, c, f, l] = fare_ratio[f] * ticket_revenue[l] - compensation[c] * overbooked[l, n]
+# Levels from seats to seats + max_extra are searched (below capacity more bookings always pay).
+# Tickets are priced with grid.ticket_revenue, the rule of grid.sensitivity_grid. overbooked: the
+# expected_overbooked_table already computed for those levels, (len(seats), max_extra + 1,
+# len(no_show_rates)) or without the seats axis for a single seat count; passing the table given to
+# sensitivity_grid makes the surface a stored view of its results instead of a second simulation.
+def build_surface(profile, seats, no_show_rates, compensations, fare_ratios=(1.0,), method="exact",
+                  max_extra=None, num_flights=1000, num_simulations=1, rng=None, overbooked=None):
+    seats = np.asarray(seats, dtype=np.int64)
+    no_show_rates = np.asarray(no_show_rates, dtype=float)
+    compensations = np.asarray(compensations, dtype=float)
+    fare_ratios = np.asarray(fare_ratios, dtype=float)
+    axes = {name: _regular_axis(name, values)
+            for name, values in zip(axis_names, (seats, no_show_rates, compensations, fare_ratios))}
+    if overbooked is not None:
+        overbooked = np.asarray(overbooked, dtype=float)
+        if overbooked.ndim == 2:
+            overbooked = overbooked[None]
+        if max_extra is None:
+            max_extra = overbooked.shape[1] - 1
+        if overbooked.shape != (len(seats), max_extra + 1, len(no_show_rates)):
+            raise ValueError(f"overbooked has shape {overbooked.shape}, expected "
+                             f"{(len(seats), max_extra + 1, len(no_show_rates))} (seats, levels, no-show rates)")
+    if max_extra is None:
+        max_extra = default_max_extra(seats.max(), no_show_rates.max())
+
+    shape = (len(seats), len(no_show_rates), len(compensations), len(fare_ratios))
+    optimal_booking_level = np.empty(shape, dtype=np.int32)
+    max_revenue = np.empty(shape)
+    fare_block = fare_ratios[None, None, :, None]
+    step = max(1, max_block_size // (len(no_show_rates) * len(fare_ratios) * (max_extra + 1)))
+
+    for i, s in enumerate(seats):
+        booking_levels = s + np.arange(max_extra + 1)
+        revenues = ticket_revenue(booking_levels, int(s), profile.class_shares, profile.economy_price,
+                                  profile.business_price, profile.first_price, profile.extra_business_share)
+        if overbooked is None:
+            table = expected_overbooked_table(booking_levels, int(s), no_show_rates, method, num_flights,
+                                              num_simulations, rng)
+        else:
+            table = overbooked[i]
+        table = table.T[:, None, None, :]  # (no-show, 1, 1, level)
+        for start in range(0, len(compensations), step):
+            block = compensations[None, start:start + step, None, None]
+            net_revenue = fare_block * revenues - block * table
+            best = np.argmax(net_revenue, axis=-1)
+            optimal_booking_level[i, :, start:start + step] = booking_levels[best]
+            max_revenue[i, :, start:start + step] = np.take_along_axis(net_revenue, best[..., None], axis=-1)[..., 0]
+
+    return BookingSurface(axes, optimal_booking_level, max_revenue, profile, method)
@@ -0,0 +1,162 @@
+import warnings
+
+import numpy as np
+
+from .analytic import binomial_pmf
+from .engine import make_rng, simulate_overbooked_per_day
+
+# Largest (trials x flights) block of uniforms drawn at once
+max_block_elements = 4_000_000
+
+schemes = ("independent", "crn", "antithetic", "sobol")
+
+
+# Show-ups by inverse binomial CDF: the smallest k with F(k) > u
+def _inverse_binomial(u, booked_per_flight, no_show_rate):
+    cdf = np.cumsum(binomial_pmf(booked_per_flight, 1 - no_show_rate))
+    return np.minimum(np.searchsorted(cdf, u, side='right'), booked_per_flight)
+
+
+# Daily overbooked totals for every level from shared uniforms u (trials, flights).
+# Inverse-CDF sampling is monotone in the booking level, so levels are coupled.
+def _overbooked_from_uniforms(u, booking_levels, seats, no_show_rate):
+    return np.stack([np.maximum(0, _inverse_binomial(u, b, no_show_rate) - seats).sum(axis=-1) for b in booking_levels])
+
+
+# Independent draws per level (the plain Monte Carlo baseline), one level and at most
+# max_block_elements show-ups at a time. Returns (levels, num_simulations).
+def independent_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng=None):
+    rng = make_rng(rng)
+    booking_levels = np.asarray(list(booking_levels))
+    result = np.empty((len(booking_levels), num_simulations), dtype=np.int64)
+
+    trials_per_block = max(1, min(num_simulations, max_block_elements // max(1, num_flights)))
+    for i, level in enumerate(booking_levels.tolist()):
+        for start in range(0, num_simulations, trials_per_block):
+            trials = min(trials_per_block, num_simulations - start)
+            result[i, start:start + trials] = simulate_overbooked_per_day(level, seats, no_show_rate, num_flights,
+                                                                          trials, rng)
+    return result
+
+
+# Common random numbers: one uniform per passenger slot, reused by every booking level.
+# Levels are visited in increasing order and each extra slot adds one Bernoulli show-up,
+# so shows (and bumps) are monotone in the level. Returns (levels, num_simulations).
+def crn_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng=None):
+    rng = make_rng(rng)
+    booking_levels = np.asarray(list(booking_levels))
+    order = np.argsort(booking_levels)
+    result = np.empty((len(booking_levels), num_simulations), dtype=np.int64)
+
+    trials_per_block = max(1, min(num_simulations, max_block_elements // max(1, num_flights)))
+    for start in range(0, num_simulations, trials_per_block):
+        trials = min(trials_per_block, num_simulations - start)
+        slots = int(booking_levels[order[0]])
+        shows = rng.binomial(slots, 1 - no_show_rate, size=(trials, num_flights))
+        for i in order:
+            while slots < booking_levels[i]:
+                shows += rng.random((trials, num_flights)) < 1 - no_show_rate
+                slots += 1
+            result[i, start:start + trials] = np.maximum(0, shows - seats).sum(axis=1)
+    return result
+
+
+# Antithetic variates: day i and day i + num_simulations // 2 use uniforms u and 1 - u
+# (shared by every level). Returns (levels, num_simulations) with the pairs in the two halves.
+def antithetic_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng=None):
+    rng = make_rng(rng)
+    half = num_simulations // 2
+    u = rng.random((half, num_flights))
+    return np.concatenate([_overbooked_from_uniforms(u, booking_levels, seats, no_show_rate),
+                           _overbooked_from_uniforms(1 - u, booking_levels, seats, no_show_rate)], axis=1)
+
+
+# Randomized quasi-Monte Carlo: `replicates` independently scrambled Sobol sequences of
+# num_simulations // replicates points in num_flights dimensions. Returns (levels, replicates, points).
+def sobol_overbooked_per_day(booking_levels, seats, no_show_rate, num_flights, num_simulations, rng=None, replicates=8):
+    try:
+        from scipy.stats import qmc
+    except ImportError as exc:
+        raise ImportError("Sobol sampling requires scipy (pip install scipy)") from exc
+
+    rng = make_rng(rng)
+    points = max(1, num_simulations // replicates)
+    samples = []
+    for _ in range(replicates):
+        sobol = qmc.Sobol(d=num_flights, scramble=True, seed=rng)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # balance properties need 2^m points
+            u = sobol.random(points)
+        samples.append(_overbooked_from_uniforms(u, booking_levels, seats, no_show_rate))
+    return np.stack(samples, axis=1)
+
+
+# Mean, estimator variance and single-draw variance of per-day samples under a scheme
+def _estimate(samples, scheme):
+    samples = np.asarray(samples, dtype=float)
+    if scheme == "sobol":
+        replicate_means = samples.mean(axis=-1)
+        mean = replicate_means.mean(axis=-1)
+        estimator_var = replicate_means.var(axis=-1, ddof=1) / replicate_means.shape[-1]
+        flat = samples.reshape(samples.shape[:-2] + (-1,))
+    elif scheme == "antithetic":
+        half = samples.shape[-1] // 2
+        pairs = (samples[..., :half] + samples[..., half:2 * half]) / 2
+        mean = pairs.mean(axis=-1)
+        estimator_var = pairs.var(axis=-1, ddof=1) / half
+        flat = samples
+    else:
+        mean = samples.mean(axis=-1)
+        estimator_var = samples.var(axis=-1, ddof=1) / samples.shape[-1]
+        flat = samples
+
+    return mean, estimator_var, flat.var(axis=-1, ddof=1)
+
+
+# Effective sample size: independent draws plain Monte Carlo would need for the same precision
+def _effective_sample_size(single_var, estimator_var, num_samples):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(estimator_var > 0, single_var / estimator_var, num_samples)
+
+
+# Booking-level revenue sweep with an opt-in variance-reduction scheme:
+# "independent" (fresh draws per level), "crn", "antithetic" or "sobol".
+# Besides the booking_level_sweep fields it reports standard errors and effective
+# sample sizes per level and for the differences between neighbouring levels.
+def variance_reduced_sweep(profile, booking_levels, num_simulations=1000, rng=None, scheme="crn", replicates=8):
+    rng = make_rng(rng)
+    booking_levels = np.asarray(list(booking_levels))
+    args = (booking_levels, profile.seats_per_flight, profile.no_show_rate, profile.num_flights, num_simulations, rng)
+
+    if scheme == "independent":
+        samples = independent_overbooked_per_day(*args)
+    elif scheme == "crn":
+        samples = crn_overbooked_per_day(*args)
+    elif scheme == "antithetic":
+        samples = antithetic_overbooked_per_day(*args)
+    elif scheme == "sobol":
+        samples = sobol_overbooked_per_day(*args, replicates=replicates)
+    else:
+        raise ValueError(f"Unknown scheme: {scheme}")
+
+    # Net revenue per flight is linear in the daily overbooked total
+    scale = profile.compensation_per_passenger / profile.num_flights
+    revenue_samples = profile.ticket_revenue(booking_levels).reshape((-1,) + (1,) * (samples.ndim - 1)) - scale * samples
+    avg_net_revenue, estimator_var, single_var = _estimate(revenue_samples, scheme)
+    _, diff_estimator_var, _ = _estimate(np.diff(revenue_samples, axis=0), scheme)
+
+    # Differences are compared against independent draws per level (variances add up)
+    ess = _effective_sample_size(single_var, estimator_var, num_simulations)
+    diff_ess = _effective_sample_size(single_var[:-1] + single_var[1:], diff_estimator_var, num_simulations)
+
+    best = int(np.argmax(avg_net_revenue))
+    return {
+        "booking_levels": booking_levels,
+        "avg_net_revenue": avg_net_revenue,
+        "standard_error": np.sqrt(estimator_var),
+        "effective_sample_size": ess,
+        "diff_standard_error": np.sqrt(diff_estimator_var),
+        "diff_effective_sample_size": diff_ess,
+        "best_booking_level": int(booking_levels[best]),
+        "best_revenue": float(avg_net_revenue[best]),
+    }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The package is imported from the repository root, like the analysis scripts do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
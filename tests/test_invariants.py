@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from overbooking.cache import cache_key
+from overbooking.kernels import kernel_overbooked_per_day
+from overbooking.profiles import domestic_profile, international_profile
+from overbooking.revenue import bump_statistics
+from overbooking.service import max_levels, normalize_scenario
+
+valid_scenario = {"seats": 200, "booked": 205, "no_show_rate": 0.04, "compensation": 1793.52, "economy_price": 200}
+
+
+# Simulated mean bumps per flight agree with the exact binomial expectation within 5 standard errors
+@pytest.mark.parametrize("profile, levels", [(domestic_profile, range(198, 216)), (international_profile, range(400, 440, 4))])
+@pytest.mark.parametrize("method", ["monte_carlo", "kernel"])
+def test_simulated_bumps_match_exact(profile, levels, method):
+    exact = bump_statistics(profile, levels, method="exact")
+    simulated = bump_statistics(profile, levels, 400, seed=0, method=method)
+    standard_error = np.sqrt(exact.var_overbooked_per_day / 400) / profile.num_flights
+    assert np.all(np.abs(simulated.avg_overbooked - exact.avg_overbooked) <= 5 * standard_error + 1e-12)
+
+
+# Different seeds never share a cache entry; unkeyable seeds are refused instead of stringified
+def test_cache_key_separates_seeds():
+    assert cache_key("sweep", seed=0) != cache_key("sweep", seed=1)
+    assert cache_key("sweep", seed=0) == cache_key("sweep", seed=np.int64(0))
+    assert cache_key("sweep", seed=np.random.SeedSequence(0)) != cache_key("sweep", seed=np.random.SeedSequence(1))
+    children = np.random.SeedSequence(0).spawn(2)
+    assert cache_key("sweep", seed=children[0]) != cache_key("sweep", seed=children[1])
+    with pytest.raises(TypeError):
+        cache_key("sweep", seed=np.random.default_rng(0))
+
+
+@pytest.mark.parametrize("changes", [
+    {"no_show_rate": 1.0},
+    {"no_show_rate": -0.1},
+    {"no_show_rate": 0.9999},
+    {"booked": 200 + max_levels + 1},
+    {"class_shares": [0.9, 0.1]},
+    {"compensation": float("nan")},
+    {"economy_price": float("inf")},
+    {"business_multiplier": float("nan")},
+])
+def test_normalize_scenario_rejects_out_of_bounds(changes):
+    with pytest.raises(ValueError):
+        normalize_scenario({**valid_scenario, **changes})
+
+
+def test_normalize_scenario_accepts_valid():
+    assert normalize_scenario(valid_scenario)[:3] == (200, 205, 0.04)
+
+
+# The counter-based stream gives the same draws for a seed, whichever backend runs it
+def test_kernel_numpy_reproducible():
+    first = kernel_overbooked_per_day([200, 205, 210], 200, 0.04, 1000, 50, rng=3, backend="numpy")
+    second = kernel_overbooked_per_day([200, 205, 210], 200, 0.04, 1000, 50, rng=3, backend="numpy")
+    assert np.array_equal(first, second)
+
+
+def test_kernel_backends_identical():
+    pytest.importorskip("numba")
+    args = ([200, 205, 210, 220], 200, 0.04, 1000, 50)
+    assert np.array_equal(kernel_overbooked_per_day(*args, rng=3, backend="numba"),
+                          kernel_overbooked_per_day(*args, rng=3, backend="numpy"))